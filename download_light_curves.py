@@ -1,19 +1,20 @@
 
-import lightkurve as lk
 import pandas as pd
 import argparse
 import os
 import warnings
-import gc
-import threading
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tqdm import tqdm
+from tqdm.asyncio import tqdm
 import time
 import logging
-
-# Global lock for FITS file operations
-_fits_lock = threading.Lock()
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from astroquery.mast import Observations
 
 # Suppress astropy/lightkurve warnings for cleaner output
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -31,116 +32,148 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# MAST endpoint for fetching a data product by its dataURI
+MAST_DOWNLOAD_URL = 'https://mast.stsci.edu/api/v0.1/Download/file'
+
+
+def create_session(max_workers=10):
+    """
+    Build a pooled requests session for the astroquery product lookups
+    (query_criteria / get_product_list), keeping TLS connections to MAST
+    alive across KICs. FITS downloads don't use it: they go through the
+    httpx client in _download_all().
+    
+    The session is swapped into private astroquery attributes; if a given
+    astroquery version doesn't have them, lookups use its default session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=max_workers,
+        pool_maxsize=max_workers * 2,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    
+    targets = [Observations]
+    for name in ('_portal_api_connection', '_service_api_connection'):
+        conn = getattr(Observations, name, None)
+        if conn is not None:
+            targets.append(conn)
+    patched = False
+    for target in targets:
+        if hasattr(target, '_session'):
+            target._session = session
+            patched = True
+    if not patched:
+        logger.warning("astroquery has no _session to replace; using its default session")
+    
+    return session
+
 
-def download_lc(kic, output_dir, skip_existing=True):
+def _init_worker():
+    """Per-process setup for lookup workers: one pooled session each"""
+    create_session(max_workers=1)
+
+
+def find_lc_product(kic):
+    """Return the dataURI of the first long-cadence light curve for a KIC, or None"""
+    obs = Observations.query_criteria(target_name=f"kplr{kic:09d}", obs_collection="Kepler")
+    if len(obs) == 0:
+        return None
+    
+    products = Observations.get_product_list(obs)
+    products = Observations.filter_products(products, productSubGroupDescription='LLC')
+    if len(products) == 0:
+        return None
+    
+    products.sort('productFilename')
+    return products['dataURI'][0]
+
+
+async def download_lc(session, kic, output_dir, skip_existing=True, lookup_pool=None):
     """
     Download a single light curve with robust error handling.
-    Thread-safe with global lock for FITS operations.
+    FITS bytes are streamed straight from MAST; every task writes its
+    own file so no locking is needed.
     
     Args:
+        session: Shared httpx.AsyncClient
         kic: Kepler Input Catalog ID
         output_dir: Directory to save FITS files
         skip_existing: Skip if file already exists
+        lookup_pool: Executor for the blocking astroquery lookup (default: thread pool)
     
     Returns:
         Tuple of (kic, success, error_message)
     """
-    import shutil
-    
     output_path = Path(output_dir) / f"{kic}.fits"
+    temp_path = output_path.with_suffix('.fits.tmp')
+    loop = asyncio.get_running_loop()
     
     # Skip if already downloaded
     if skip_existing and output_path.exists():
         return (kic, 'skipped', None)
     
-    def clear_kic_cache(kic_id):
-        """Clear all cache entries for a specific KIC"""
-        cache_dir = Path.home() / '.lightkurve' / 'cache'
-        if cache_dir.exists():
-            for item in cache_dir.glob(f'**/kplr{kic_id:09d}*'):
-                try:
-                    if item.is_dir():
-                        shutil.rmtree(item, ignore_errors=True)
-                    elif item.is_file():
-                        item.unlink(missing_ok=True)
-                except:
-                    pass
-    
     # Attempt download with retry logic
     max_attempts = 2
     for attempt in range(max_attempts):
         try:
-            # Clear cache before retry attempt
-            if attempt > 0:
-                clear_kic_cache(kic)
+            # Search for light curve (astroquery is blocking, keep it off the loop)
+            data_uri = await loop.run_in_executor(lookup_pool, find_lc_product, kic)
             
-            # Search for light curve
-            search_result = lk.search_lightcurve(f"KIC {kic}", mission='Kepler')
-            
-            if len(search_result) == 0:
+            if data_uri is None:
                 return (kic, 'failed', 'No light curve found')
             
-            # Download the light curve
-            lc = search_result[0].download()
+            # Stream the FITS file to a temp path
+            async with session.stream('GET', MAST_DOWNLOAD_URL, params={'uri': data_uri}) as resp:
+                resp.raise_for_status()
+                with open(temp_path, 'wb') as f:
+                    async for chunk in resp.aiter_bytes(65536):
+                        f.write(chunk)
             
-            # Thread-safe FITS file write operation
-            with _fits_lock:
-                temp_path = str(output_path) + '.tmp'
-                lc.to_fits(temp_path, overwrite=True)
-                
-                # Explicitly close any file handles
-                del lc
-                gc.collect()
-                
-                # Rename temp file to final name (atomic operation)
-                shutil.move(temp_path, str(output_path))
+            # Rename temp file to final name (atomic operation)
+            os.replace(temp_path, output_path)
             
             return (kic, 'success', None)
             
         except Exception as e:
-            error_str = str(e).lower()
-            
-            # Check if this is a retryable error (cache corruption or I/O issues)
-            is_retryable = any(keyword in error_str for keyword in [
-                'corrupt', 'interrupted', 'i/o operation', 'closed file'
-            ])
+            # Retry dropped connections and server errors once
+            is_retryable = isinstance(e, httpx.TransportError) or (
+                isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (502, 503, 504)
+            )
             
             # If retryable and we have attempts left, try again
             if is_retryable and attempt < max_attempts - 1:
+                await asyncio.sleep(0.5)
                 continue
             
             # Clean up temp file if it exists
-            temp_path = str(output_path) + '.tmp'
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
+            temp_path.unlink(missing_ok=True)
             
             # Return failure
             return (kic, 'failed', str(e))
 
 
-def download_batch(kepids, output_dir='lightcurves', max_workers=10, skip_existing=True):
-    # Create output directory if it doesn't exist
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+async def _download_all(kepids, output_dir, max_workers, skip_existing, stats, lookup_pool):
+    sem = asyncio.Semaphore(max_workers)
     
-    stats = {'success': 0, 'failed': 0, 'skipped': 0, 'errors': []}
+    async def sem_wrapped(coro):
+        async with sem:
+            return await coro
     
-    logger.info(f"Starting download of {len(kepids)} light curves using {max_workers} workers")
+    # HTTP/2 multiplexes the concurrent downloads over a few TLS connections
+    limits = httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=120)
     
-    # Use ThreadPoolExecutor with thread-safe FITS operations
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all download tasks
-        future_to_kic = {
-            executor.submit(download_lc, kic, output_dir, skip_existing): kic 
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=httpx.Timeout(60.0), follow_redirects=True) as session:
+        tasks = [
+            sem_wrapped(download_lc(session, kic, output_dir, skip_existing, lookup_pool))
             for kic in kepids
-        }
+        ]
         
         # Process results with progress bar
         with tqdm(total=len(kepids), desc="Downloading", unit="files") as pbar:
-            for future in as_completed(future_to_kic):
-                kic, status, error = future.result()
+            for future in asyncio.as_completed(tasks):
+                kic, status, error = await future
                 
                 if status == 'success':
                     stats['success'] += 1
@@ -157,10 +190,37 @@ def download_batch(kepids, output_dir='lightcurves', max_workers=10, skip_existi
                     'Skip': stats['skipped'],
                     'Fail': stats['failed']
                 })
+
+
+def download_batch(kepids, output_dir='lightcurves', max_workers=10, skip_existing=True):
+    # Create output directory if it doesn't exist
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    stats = {'success': 0, 'failed': 0, 'skipped': 0, 'errors': []}
+    
+    logger.info(f"Starting download of {len(kepids)} light curves using {max_workers} workers")
+    
+    # astroquery lookups parse VOTables in Python; run them in worker processes
+    # so they don't contend for the GIL with the event loop
+    methods = multiprocessing.get_all_start_methods()
+    mp_context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context, initializer=_init_worker) as pool:
+        asyncio.run(_download_all(kepids, output_dir, max_workers, skip_existing, stats, pool))
     
     return stats
 
 
+def load_kepids(csv_path):
+    """Read only the kepid column (pyarrow parser when available)"""
+    try:
+        import pyarrow  # noqa: F401
+        df = pd.read_csv(csv_path, usecols=['kepid'], engine='pyarrow')
+    except ImportError:
+        df = pd.read_csv(csv_path, usecols=['kepid'])
+    return df['kepid'].unique().tolist()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Download Kepler light curves in parallel',
@@ -203,8 +263,7 @@ def main():
     
     # Load KepIDs from CSV
     logger.info(f"Loading KepIDs from {args.input}")
-    df = pd.read_csv(args.input)
-    kepids = df['kepid'].unique().tolist()
+    kepids = load_kepids(args.input)
     
     # Apply limit if specified
     if args.limit:
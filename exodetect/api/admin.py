@@ -36,7 +36,16 @@ class PredictionAdmin(admin.ModelAdmin):
 @admin.register(ExplainabilityData)
 class ExplainabilityDataAdmin(admin.ModelAdmin):
     list_display = ['id', 'prediction', 'uncertainty_epistemic', 'uncertainty_aleatoric', 'created_at']
+    list_select_related = ['prediction']
     readonly_fields = ['id', 'created_at']
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        # The change list only shows summary columns, so skip the array payloads
+        match = request.resolver_match
+        if match is not None and match.url_name.endswith('_changelist'):
+            qs = qs.only(*ExplainabilityData.LIST_FIELDS, 'prediction__predicted_class_name', 'prediction__confidence')
+        return qs
 
 
 @admin.register(UserFeedback)
@@ -1,6 +1,122 @@
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _is_runserver():
+    """True in the runserver process that serves requests (not the autoreloader)"""
+    return os.environ.get('RUN_MAIN') == 'true'
+
+
+def _is_gunicorn():
+    """True in any gunicorn process (master or worker)"""
+    return bool(sys.argv) and 'gunicorn' in os.path.basename(sys.argv[0])
+
+
+def _gunicorn_boot_hooks():
+    """True when gunicorn.conf.py's when_ready/post_fork hooks do the boot work"""
+    return os.environ.get('EXOHUNT_GUNICORN_HOOKS') == '1'
+
+
+def _gunicorn_preloading():
+    """True in a gunicorn master started with --preload outside gunicorn.conf.py"""
+    args = sys.argv[1:] + os.environ.get('GUNICORN_CMD_ARGS', '').split()
+    return '--preload' in args
+
+
+def _set_torch_threads():
+    import torch
+    
+    num_threads = getattr(settings, 'TORCH_NUM_THREADS', None)
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+
+def warm_up(forking=False):
+    """
+    Compile the analysis kernels and load the predictor so the first request
+    doesn't pay for them.
+    
+    With forking=True this runs in the gunicorn master and only does work
+    that survives fork: the model is loaded only if it will run on the CPU,
+    because a CUDA/MPS context can't be used in a forked child. Workers then
+    load it in worker_boot().
+    """
+    from .flux_utils import warmup_kernels
+    from .inference import select_device
+    from .views import get_predictor
+    from .visualization import warmup_analysis_kernels
+    
+    try:
+        warmup_kernels()
+        warmup_analysis_kernels()
+    except Exception as e:
+        print(f"Kernel warmup failed: {e}")
+    
+    if forking and select_device().type != 'cpu':
+        return
+    try:
+        get_predictor()
+    except Exception as e:
+        print(f"Predictor warmup failed: {e}")
+
+
+def start_example_prefetch():
+    """Fetch the curated example light curves in a background thread"""
+    if not getattr(settings, 'EXAMPLE_PREFETCH', True):
+        return
+    from .views import prefetch_example_light_curves
+    
+    threading.Thread(
+        target=prefetch_example_light_curves, name='example-prefetch', daemon=True
+    ).start()
+
+
+def master_boot():
+    """
+    Called from gunicorn's when_ready hook (gunicorn.conf.py) in the
+    preloading master, right before it forks the workers.
+    """
+    import torch
+    
+    # Keep torch single-threaded so no OpenMP pool exists at fork time;
+    # workers set TORCH_NUM_THREADS themselves in worker_boot()
+    torch.set_num_threads(1)
+    if getattr(settings, 'PREDICTOR_WARMUP', True):
+        warm_up(forking=True)
+
+
+def worker_boot():
+    """
+    Startup for a process that serves requests and won't fork again: a
+    gunicorn worker (from the post_fork hook, or from ready() when gunicorn
+    runs without gunicorn.conf.py) or the runserver process. Sets the torch
+    thread count, warms up (cheap for whatever the master already loaded)
+    and starts the example prefetch, which must never run in a master that
+    is about to fork: a thread holding a lock at fork time leaves it held in
+    every worker.
+    """
+    _set_torch_threads()
+    if getattr(settings, 'PREDICTOR_WARMUP', True):
+        warm_up()
+    start_example_prefetch()
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        
+        # Load the model at boot so the first prediction doesn't pay for it
+        if _is_runserver():
+            worker_boot()
+        elif _is_gunicorn() and not _gunicorn_boot_hooks() and not _gunicorn_preloading():
+            # Plain `gunicorn exodetect.wsgi`: ready() runs inside each worker, after fork.
+            # With --preload but no gunicorn.conf.py nothing runs after fork, so workers
+            # load the model on their first request instead.
+            worker_boot()
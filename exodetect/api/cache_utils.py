@@ -2,23 +2,70 @@
 Caching utilities for FITS files to avoid repeated downloads
 """
 import os
+import json
 import time
+import uuid
+import shutil
+import threading
+import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict
 import hashlib
 
+import numpy as np
+
+from .flux_utils import read_fits_light_curve
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 # Cache directory for downloaded FITS files
 CACHE_DIR = Path(__file__).parent.parent.parent / 'lightcurves_cache'
 CACHE_DIR.mkdir(exist_ok=True)
 
+# Parsed time/flux arrays, one .npz per FITS file version
+ARRAY_CACHE_DIR = CACHE_DIR / 'arrays'
+
 # Cache metadata: kepid -> (filepath, timestamp)
 _cache = {}
+_cache_lock = threading.Lock()
+_last_scan = 0.0
 CACHE_EXPIRY = 3600 * 24  # 24 hours
+CACHE_RESCAN_INTERVAL = 60  # seconds between directory sweeps on a miss
+
+
+def _scan_cache_dir():
+    """Rebuild _cache from one scandir sweep of CACHE_DIR"""
+    global _last_scan
+    entries = {}
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith('.fits') and name[:-5].isdigit():
+                    try:
+                        entries[int(name[:-5])] = (entry.path, entry.stat().st_mtime)
+                    except OSError:
+                        continue
+    except OSError:
+        pass
+    
+    with _cache_lock:
+        _cache.clear()
+        _cache.update(entries)
+        _last_scan = time.monotonic()
+
+
+_scan_cache_dir()
 
 
 def get_cached_fits(kepid: int) -> Optional[str]:
     """
-    Get cached FITS file path if it exists and is not expired.
+    Get cached FITS file path if it exists and is not expired. Hits are
+    checked against the disk, since another process may have cleared the
+    cache since this one last swept it.
     
     Args:
         kepid: Kepler ID
@@ -26,13 +73,20 @@ def get_cached_fits(kepid: int) -> Optional[str]:
     Returns:
         Path to cached FITS file or None if not in cache
     """
-    cache_path = CACHE_DIR / f"{kepid}.fits"
+    entry = _cache.get(kepid)
     
-    # Check if file exists and is recent
-    if cache_path.exists():
-        age = time.time() - cache_path.stat().st_mtime
-        if age < CACHE_EXPIRY:
-            return str(cache_path)
+    # Other processes may have added files since the last sweep
+    if entry is None and time.monotonic() - _last_scan > CACHE_RESCAN_INTERVAL:
+        _scan_cache_dir()
+        entry = _cache.get(kepid)
+    
+    # Check if file is recent
+    if entry is not None and time.time() - entry[1] < CACHE_EXPIRY:
+        if os.path.exists(entry[0]):
+            return entry[0]
+        with _cache_lock:
+            if _cache.get(kepid) == entry:
+                del _cache[kepid]
     
     return None
 
@@ -48,16 +102,64 @@ def save_to_cache(kepid: int, fits_path: str) -> str:
     Returns:
         Path to cached file
     """
-    import shutil
-    
     cache_path = CACHE_DIR / f"{kepid}.fits"
+    tmp_path = CACHE_DIR / f".{kepid}.{uuid.uuid4().hex}.tmp"
+    
+    # Link/clone into the cache, then atomically swap into place
+    try:
+        _link_or_copy(fits_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
     
-    # Copy file to cache
-    shutil.copy2(fits_path, cache_path)
+    with _cache_lock:
+        _cache[int(kepid)] = (str(cache_path), cache_path.stat().st_mtime)
     
     return str(cache_path)
 
 
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)); not exposed by fcntl before 3.12
+FICLONE = getattr(fcntl, 'FICLONE', 0x40049409) if fcntl is not None else None
+
+
+def _link_or_copy(src, dst):
+    """
+    Materialize src at dst without a userspace copy where possible:
+    hardlink, then reflink (FICLONE), then in-kernel copy_file_range,
+    then a plain copy. Timestamps are preserved like shutil.copy2.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        cloned = False
+        if FICLONE is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                cloned = True
+            except OSError:
+                pass
+        
+        if not cloned:
+            try:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except (AttributeError, OSError):
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                shutil.copyfileobj(fsrc, fdst)
+    
+    shutil.copystat(src, dst)
+
+
 def clear_cache(max_age_hours: Optional[int] = None):
     """
     Clear old cached files.
@@ -67,16 +169,68 @@ def clear_cache(max_age_hours: Optional[int] = None):
     """
     if max_age_hours is None:
         # Remove all
-        import shutil
         shutil.rmtree(CACHE_DIR, ignore_errors=True)
         CACHE_DIR.mkdir(exist_ok=True)
+        _scan_cache_dir()
         return
     
     # Remove old files
     cutoff_time = time.time() - (max_age_hours * 3600)
-    for fits_file in CACHE_DIR.glob('*.fits'):
-        if fits_file.stat().st_mtime < cutoff_time:
-            fits_file.unlink(missing_ok=True)
+    for cached_file in [*CACHE_DIR.glob('*.fits'), *ARRAY_CACHE_DIR.glob('*.npz')]:
+        if cached_file.stat().st_mtime < cutoff_time:
+            cached_file.unlink(missing_ok=True)
+    _scan_cache_dir()
+
+
+def get_cached_light_curve(fits_path) -> Dict:
+    """
+    read_fits_light_curve() backed by an on-disk array cache. Entries are
+    keyed by path, size and mtime, so a rewritten file is parsed again.
+    
+    Args:
+        fits_path: Path to a FITS file that stays in place (not a temp upload)
+        
+    Returns:
+        Same dictionary as read_fits_light_curve()
+    """
+    stat = os.stat(fits_path)
+    key = hashlib.sha1(
+        f"{os.path.abspath(fits_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+    ).hexdigest()
+    cache_path = ARRAY_CACHE_DIR / f"{key}.npz"
+    
+    try:
+        with np.load(cache_path) as data:
+            kepid = int(data['kepid'])
+            return {
+                'time': data['time'],
+                'flux': data['flux'],
+                'flux_type': str(data['flux_type']),
+                'kepid': kepid if kepid >= 0 else None,
+            }
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        pass
+    
+    light_curve = read_fits_light_curve(fits_path)
+    
+    ARRAY_CACHE_DIR.mkdir(exist_ok=True)
+    tmp_path = ARRAY_CACHE_DIR / f".{key}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                time=light_curve['time'],
+                flux=light_curve['flux'],
+                flux_type=np.array(light_curve['flux_type']),
+                kepid=np.array(light_curve['kepid'] if light_curve['kepid'] is not None else -1)
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    
+    return light_curve
 
 
 def get_cache_stats():
@@ -89,3 +243,214 @@ def get_cache_stats():
         'size_mb': total_size / (1024 * 1024),
         'cache_dir': str(CACHE_DIR)
     }
+
+
+class PackedFluxCache:
+    """
+    Processed flux arrays for many KICs packed into one memory-mapped
+    float32[N, seq_len] .npy file, with a JSON kepid -> row index.
+    
+    A hit is a dict lookup plus a row read from the shared mmap, instead of
+    an exists() + open() per KIC. Rows are append-only; the file grows in
+    chunks of GROW_ROWS. Reads map the file read-only, so a cache on a
+    read-only volume still serves hits; only put() maps it writable.
+    
+    Note: put() rewrites the whole JSON index for every new kepid, which is
+    O(N) per insert. That is fine for the few thousand KICs of the KOI
+    catalogue but not for filling a much larger cache one row at a time.
+    """
+    
+    DATA_FILE = 'flux_packed.npy'
+    INDEX_FILE = 'flux_index.json'
+    LOCK_FILE = 'flux_packed.lock'
+    GROW_ROWS = 1024
+    
+    def __init__(self, cache_dir: str, seq_len: int):
+        self.cache_dir = Path(cache_dir)
+        self.seq_len = seq_len
+        self.data_path = self.cache_dir / self.DATA_FILE
+        self.index_path = self.cache_dir / self.INDEX_FILE
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._index_mtime = None
+        self._mmap = None
+        self._load()
+    
+    def _load(self):
+        """(Re)load the index and mmap from disk"""
+        try:
+            index_mtime = self.index_path.stat().st_mtime_ns
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index_mtime, index = None, {}
+        
+        mmap = None
+        if index and self.data_path.exists():
+            mmap = np.load(self.data_path, mmap_mode='r')
+            if mmap.ndim != 2 or mmap.shape[1] != self.seq_len:
+                mmap = None
+        if mmap is None:
+            index = {}
+        
+        # Swap mmap before index so readers never see rows past the mapped file
+        self._mmap = mmap
+        self._index = index
+        self._index_mtime = index_mtime
+    
+    def _index_changed(self) -> bool:
+        try:
+            return self.index_path.stat().st_mtime_ns != self._index_mtime
+        except OSError:
+            return self._index_mtime is not None
+    
+    def get(self, kepid, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Return a copy of the cached row for kepid (written into out if given), or None"""
+        key = str(kepid)
+        row = self._index.get(key)
+        if row is None and self._index_changed():
+            # Another process may have appended rows
+            with self._lock:
+                self._load()
+            row = self._index.get(key)
+        if row is None:
+            return None
+        if out is not None:
+            np.copyto(out, self._mmap[row])
+            return out
+        return np.array(self._mmap[row])
+    
+    def put(self, kepid, arr: np.ndarray):
+        """Store a processed flux array for kepid"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key = str(kepid)
+        
+        with self._lock, open(self.cache_dir / self.LOCK_FILE, 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if self._index_changed():
+                self._load()
+            
+            row = self._index.get(key)
+            if row is None:
+                row = len(self._index)
+                self._ensure_capacity(row + 1)
+            # The read-only mapping shares pages with this one and sees the write
+            rows = np.load(self.data_path, mmap_mode='r+')
+            rows[row] = arr[:self.seq_len]
+            rows.flush()
+            del rows
+            
+            if key not in self._index:
+                self._index[key] = row
+                tmp_path = self.index_path.with_suffix('.json.tmp')
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._index, f)
+                os.replace(tmp_path, self.index_path)
+                self._index_mtime = self.index_path.stat().st_mtime_ns
+    
+    def _ensure_capacity(self, rows: int):
+        capacity = 0 if self._mmap is None else self._mmap.shape[0]
+        if rows <= capacity:
+            return
+        
+        new_capacity = (rows // self.GROW_ROWS + 1) * self.GROW_ROWS
+        tmp_path = self.data_path.with_suffix('.npy.tmp')
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode='w+', dtype=np.float32, shape=(new_capacity, self.seq_len)
+        )
+        if capacity:
+            grown[:capacity] = self._mmap
+        grown.flush()
+        del grown
+        os.replace(tmp_path, self.data_path)
+        self._mmap = np.load(self.data_path, mmap_mode='r')
+
+
+# Open packed caches: (cache_dir, seq_len) -> PackedFluxCache
+_flux_caches = {}
+_flux_caches_lock = threading.Lock()
+
+
+def get_flux_cache(cache_dir: str, seq_len: int) -> PackedFluxCache:
+    """Get the shared PackedFluxCache for a cache directory"""
+    key = (os.path.abspath(cache_dir), seq_len)
+    cache = _flux_caches.get(key)
+    if cache is None:
+        with _flux_caches_lock:
+            cache = _flux_caches.get(key)
+            if cache is None:
+                cache = _flux_caches[key] = PackedFluxCache(cache_dir, seq_len)
+    return cache
+
+
+def file_sha256(path) -> str:
+    """Streaming SHA-256 of a file on disk"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+# ============================================================================
+# Dashboard response cache (Django cache backend)
+# ============================================================================
+
+def plot_cache_key(fits_path, title: str, content_sha256: Optional[str] = None) -> str:
+    """
+    Cache key for a rendered light curve plot. Files that stay on disk are
+    keyed by path, size and mtime like the array cache; one-off uploads by
+    their content hash, so re-uploading the same file still hits.
+    """
+    if content_sha256:
+        source = content_sha256
+    else:
+        stat = os.stat(fits_path)
+        source = f"{os.path.abspath(fits_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    # v2: plots of long light curves are downsampled
+    return 'plot:v2:' + hashlib.sha1(f"{source}:{title}".encode()).hexdigest()
+
+
+DASHBOARD_VERSION_KEY = 'dashboard:version'
+
+# This worker's copy of the version token: (monotonic time it goes stale, token)
+_dashboard_version = (0.0, None)
+
+
+def _dashboard_version_token() -> str:
+    """The shared version token, re-read at most once per DASHBOARD_VERSION_TTL"""
+    global _dashboard_version
+    from django.conf import settings
+    from django.core.cache import caches
+    
+    stale_at, version = _dashboard_version
+    now = time.monotonic()
+    if version is None or now >= stale_at:
+        version = caches['shared'].get_or_set(DASHBOARD_VERSION_KEY, lambda: uuid.uuid4().hex, timeout=None)
+        _dashboard_version = (now + getattr(settings, 'DASHBOARD_VERSION_TTL', 2), version)
+    return version
+
+
+def dashboard_cache_key(name: str, *parts) -> str:
+    """
+    Cache key for a dashboard response. Keys embed a version token, so
+    invalidate_dashboard_cache() retires every cached page at once. The
+    pages live in each worker's local cache and the token in the shared
+    file cache, so a write in one worker reaches all of them. Each worker
+    re-reads the token at most every DASHBOARD_VERSION_TTL seconds, so
+    another worker's write can take that long to show up on its dashboards.
+    """
+    return ':'.join(['dashboard', name, _dashboard_version_token(), *map(str, parts)])
+
+
+def invalidate_dashboard_cache():
+    """
+    Drop all cached dashboard responses (called when predictions change).
+    Costs one small file write; bulk writers call it once per batch.
+    """
+    global _dashboard_version
+    from django.conf import settings
+    from django.core.cache import caches
+    
+    version = uuid.uuid4().hex
+    caches['shared'].set(DASHBOARD_VERSION_KEY, version, timeout=None)
+    # This worker sees its own writes immediately
+    _dashboard_version = (time.monotonic() + getattr(settings, 'DASHBOARD_VERSION_TTL', 2), version)
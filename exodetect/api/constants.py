@@ -0,0 +1,9 @@
+"""
+Class labels shared by the model wrapper, models and serializers
+"""
+
+# Display names, indexed by the model's output class
+CLASS_NAMES = ('FALSE POSITIVE', 'CANDIDATE', 'CONFIRMED')
+
+# Keys of the per-class probability dicts in API responses, same order
+PROBABILITY_KEYS = ('FALSE_POSITIVE', 'CANDIDATE', 'CONFIRMED')
@@ -0,0 +1,103 @@
+"""
+Bulk database writes for batch prediction jobs
+"""
+import io
+from collections import Counter
+from typing import List
+
+from django.db import connections, router, transaction
+
+from .cache_utils import invalidate_dashboard_cache
+from .models import Prediction
+from .signals import bump_session_counts
+
+
+# Below this many rows a multi-row INSERT is as fast as COPY
+COPY_MIN_ROWS = 64
+
+
+def _copy_text(value) -> str:
+    """Encode one value for PostgreSQL's COPY text format"""
+    if value is None:
+        return '\\N'
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def _copy_predictions(predictions: List[Prediction], connection):
+    """Stream prediction rows to PostgreSQL with COPY FROM STDIN"""
+    # Columns with a database default (created_at) are left for PostgreSQL to fill
+    fields = [f for f in Prediction._meta.concrete_fields if not f.has_db_default()]
+    db_default_fields = [f for f in Prediction._meta.concrete_fields if f.has_db_default()]
+    quote = connection.ops.quote_name
+
+    buf = io.StringIO()
+    for obj in predictions:
+        buf.write('\t'.join(
+            _copy_text(field.get_db_prep_save(field.pre_save(obj, True), connection))
+            for field in fields
+        ))
+        buf.write('\n')
+
+    sql = 'COPY {} ({}) FROM STDIN'.format(
+        quote(Prediction._meta.db_table),
+        ', '.join(quote(field.column) for field in fields)
+    )
+
+    with connection.cursor() as cursor:
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, 'copy'):
+            # psycopg 3
+            with raw_cursor.copy(sql) as copy:
+                copy.write(buf.getvalue())
+        else:
+            # psycopg2
+            buf.seek(0)
+            raw_cursor.copy_expert(sql, buf)
+
+    for obj in predictions:
+        obj._state.adding = False
+        obj._state.db = connection.alias
+        # COPY returns nothing, so defer the DB-filled columns; they load on first access
+        for field in db_default_fields:
+            obj.__dict__.pop(field.attname, None)
+
+
+def persist_predictions(predictions: List[Prediction], batch_size: int = 1000) -> List[Prediction]:
+    """
+    Insert a batch of unsaved Prediction objects in as few round trips as possible.
+    Uses COPY on PostgreSQL for large batches and bulk_create everywhere else.
+
+    Note: like bulk_create, this does not call save() or send model signals;
+    session counters and the dashboard cache are updated directly instead.
+
+    Args:
+        predictions: Unsaved Prediction instances (primary keys already assigned)
+        batch_size: Rows per INSERT statement for bulk_create
+
+    Returns:
+        The same list, now saved
+    """
+    if not predictions:
+        return predictions
+
+    alias = router.db_for_write(Prediction)
+    connection = connections[alias]
+
+    if connection.vendor == 'postgresql' and len(predictions) >= COPY_MIN_ROWS:
+        with transaction.atomic(using=alias):
+            _copy_predictions(predictions, connection)
+    else:
+        Prediction.objects.using(alias).bulk_create(predictions, batch_size=batch_size)
+
+    # Bulk writes skip post_save, so do its bookkeeping here
+    bump_session_counts(Counter(obj.session_id for obj in predictions))
+    invalidate_dashboard_cache()
+    return predictions
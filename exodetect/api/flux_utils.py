@@ -1,7 +1,47 @@
 """
-Utility functions for extracting flux from lightkurve objects
+Utility functions for extracting flux from lightkurve objects and FITS tables
 """
+from functools import lru_cache
+from typing import Dict
+
 import numpy as np
+from astropy.io import fits
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import fitsio
+except ImportError:
+    fitsio = None
+
+# Preferred flux columns, highest priority first (matched case-insensitively)
+PREFERRED_FLUX_COLUMNS = ('pdcsap_flux', 'sap_flux', 'flux')
+
+# Quality flag columns, same priority as lightkurve's Kepler reader
+QUALITY_COLUMNS = ('sap_quality', 'quality')
+
+# lightkurve.utils.KeplerQualityFlags.DEFAULT_BITMASK, applied by lk.read()
+KEPLER_DEFAULT_BITMASK = 1130799
+
+
+@lru_cache(maxsize=64)
+def _resolve_flux_column(colnames):
+    """
+    Pick the flux column for a schema. Keyed by the tuple of column names,
+    so files with identical layouts resolve once.
+    """
+    lower_map = {}
+    for c in colnames:
+        lower_map.setdefault(c.lower(), c)
+    
+    for name in PREFERRED_FLUX_COLUMNS:
+        actual = lower_map.get(name)
+        if actual is not None:
+            return actual
+    return None
 
 
 def get_flux_from_lc(lc):
@@ -18,17 +58,12 @@ def get_flux_from_lc(lc):
     flux = None
     
     # Try different column names (case-insensitive, prioritize PDCSAP)
-    preferred_order = ['pdcsap_flux', 'sap_flux', 'flux']
-    
-    for col_name in preferred_order:
-        try:
-            if col_name.lower() in [c.lower() for c in lc.colnames]:
-                # Find the actual column name (preserving case)
-                actual_col = [c for c in lc.colnames if c.lower() == col_name.lower()][0]
-                flux = lc[actual_col].value
-                return flux
-        except (KeyError, AttributeError):
-            continue
+    try:
+        actual_col = _resolve_flux_column(tuple(lc.colnames))
+        if actual_col is not None:
+            return lc[actual_col].value
+    except (KeyError, AttributeError):
+        pass
     
     # Fallback: try flux attribute
     if flux is None:
@@ -77,3 +112,283 @@ def get_time_from_lc(lc):
         return np.arange(len(flux))
     except:
         return np.arange(len(lc))
+
+
+def _native(arr):
+    """Copy a FITS column into a native-endian array"""
+    return np.asarray(arr, dtype=arr.dtype.newbyteorder('='))
+
+
+def _read_columns_fitsio(fits_path):
+    """
+    TIME, flux and quality columns plus KEPLERID through CFITSIO, which
+    reads just those columns without building astropy HDU/table objects.
+    """
+    with fitsio.FITS(fits_path) as f:
+        hdu = f[1]
+        names = tuple(hdu.get_colnames())
+        flux_col = _resolve_flux_column(names)
+        if flux_col is None:
+            raise ValueError("Could not extract flux data from light curve")
+        
+        lower_map = {c.lower(): c for c in names}
+        quality_col = next((lower_map[n] for n in QUALITY_COLUMNS if n in lower_map), None)
+        columns = ['TIME', flux_col] + ([quality_col] if quality_col else [])
+        data = hdu.read(columns=columns)
+        kepid = f[0].read_header().get('KEPLERID')
+    
+    quality = data[quality_col] if quality_col else None
+    return _native(data['TIME']), _native(data[flux_col]), quality, flux_col, kepid
+
+
+def _read_columns_astropy(fits_path):
+    """TIME and flux columns, the kept-cadence mask and KEPLERID via memmapped astropy"""
+    with fits.open(fits_path, memmap=True, mode='readonly') as hdul:
+        hdu = hdul[1]
+        names = tuple(hdu.columns.names)
+        flux_col = _resolve_flux_column(names)
+        if flux_col is None:
+            raise ValueError("Could not extract flux data from light curve")
+        
+        data = hdu.data
+        time = _native(data['TIME'])
+        flux = _native(data[flux_col])
+        
+        keep = ~np.isnan(time)
+        lower_map = {c.lower(): c for c in names}
+        for name in QUALITY_COLUMNS:
+            if name in lower_map:
+                keep &= (data[lower_map[name]] & KEPLER_DEFAULT_BITMASK) == 0
+                break
+        
+        kepid = hdul[0].header.get('KEPLERID')
+    
+    return time, flux, keep, flux_col, kepid
+
+
+def read_fits_light_curve(fits_path) -> Dict:
+    """
+    Read time and flux straight from a FITS light curve table without
+    building a lightkurve object. Cadences are filtered the way lk.read()
+    does by default (NaN times and default-bitmask quality flags dropped).
+    Reads through fitsio when it is installed, memmapped astropy otherwise.
+    
+    Args:
+        fits_path: Path to FITS file
+        
+    Returns:
+        Dictionary with time, flux, flux_type and kepid (from the header)
+    """
+    if fitsio is not None:
+        time, flux, quality, flux_col, kepid = _read_columns_fitsio(fits_path)
+        keep = ~np.isnan(time)
+        if quality is not None:
+            keep &= (quality & KEPLER_DEFAULT_BITMASK) == 0
+    else:
+        time, flux, keep, flux_col, kepid = _read_columns_astropy(fits_path)
+    
+    if not keep.all():
+        time = time[keep]
+        flux = flux[keep]
+    
+    return {
+        'time': time,
+        'flux': flux,
+        'flux_type': flux_col.upper(),
+        'kepid': int(kepid) if kepid is not None else None,
+    }
+
+
+def _cadence_summary(time, flux, quality, bitmask):
+    """
+    Single pass over the cadences: kept count, finite-flux count and the
+    first/last kept timestamp. Mirrors the NumPy path in read_fits_metadata().
+    """
+    flux_points = 0
+    valid_points = 0
+    first = np.nan
+    last = np.nan
+    for i in range(time.shape[0]):
+        t = time[i]
+        if np.isnan(t) or (quality[i] & bitmask) != 0:
+            continue
+        if flux_points == 0:
+            first = t
+        last = t
+        flux_points += 1
+        if not np.isnan(flux[i]):
+            valid_points += 1
+    return flux_points, valid_points, first, last
+
+
+# No fastmath: it lets LLVM assume there are no NaNs, which is exactly what we count
+if njit is not None:
+    _cadence_summary = njit(cache=True, nogil=True, boundscheck=False)(_cadence_summary)
+
+
+def _flux_stats(time, flux):
+    """
+    One pass over the cadences for the finite-flux count, Welford mean/std
+    and time span, collecting the finite values as it goes; the medians
+    then only touch those compacted arrays. Mirrors the NumPy path in
+    lightcurve_stats().
+    """
+    n = flux.shape[0]
+    valid_time = np.empty(n, dtype=np.float64)
+    valid_flux = np.empty(n, dtype=np.float64)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    t_min = np.inf
+    t_max = -np.inf
+    for i in range(n):
+        f = flux[i]
+        if np.isnan(f):
+            continue
+        t = time[i]
+        valid_time[count] = t
+        valid_flux[count] = f
+        count += 1
+        delta = f - mean
+        mean += delta / count
+        m2 += delta * (f - mean)
+        if t < t_min:
+            t_min = t
+        if t > t_max:
+            t_max = t
+    
+    if count == 0:
+        return 0, np.nan, np.nan, np.nan, 0, 0.0
+    
+    median = np.median(valid_flux[:count])
+    
+    gaps = 0
+    if count > 1:
+        dt = np.empty(count - 1, dtype=np.float64)
+        for i in range(count - 1):
+            dt[i] = valid_time[i + 1] - valid_time[i]
+        threshold = np.median(dt) * 3
+        for i in range(count - 1):
+            if dt[i] > threshold:
+                gaps += 1
+    
+    return count, mean, np.sqrt(m2 / count), median, gaps, t_max - t_min
+
+
+if njit is not None:
+    _flux_stats = njit(cache=True, nogil=True, boundscheck=False)(_flux_stats)
+
+
+def lightcurve_stats(time, flux) -> Dict:
+    """
+    Summary statistics over the finite-flux cadences, as shown alongside a
+    plotted light curve. Uses a Numba kernel when numba is installed, NumPy
+    otherwise.
+    
+    Returns:
+        Dictionary with valid_points, mean, std, median, gaps and duration_days
+    """
+    if njit is not None:
+        count, mean, std, median, gaps, duration = _flux_stats(
+            np.ascontiguousarray(time, dtype=np.float64),
+            np.ascontiguousarray(flux, dtype=flux.dtype.newbyteorder('='))
+        )
+    else:
+        valid_mask = ~np.isnan(flux)
+        time_clean = time[valid_mask]
+        flux_clean = flux[valid_mask]
+        count = len(time_clean)
+        if count == 0:
+            mean = std = median = np.nan
+            gaps = 0
+            duration = 0.0
+        else:
+            mean = np.mean(flux_clean)
+            std = np.std(flux_clean)
+            median = np.median(flux_clean)
+            dt = np.diff(time_clean)
+            gaps = int(np.sum(dt > np.median(dt) * 3)) if count > 1 else 0
+            duration = time_clean.max() - time_clean.min()
+    
+    return {
+        'valid_points': int(count),
+        'mean': float(mean),
+        'std': float(std),
+        'median': float(median),
+        'gaps': int(gaps),
+        'duration_days': float(duration),
+    }
+
+
+def warmup_kernels():
+    """Compile (or load from cache) the JIT kernels so the first request doesn't pay for it"""
+    if njit is None:
+        return
+    time = np.zeros(2, dtype=np.float64)
+    for flux_dtype in (np.float32, np.float64):
+        _cadence_summary(time, np.zeros(2, dtype=flux_dtype), np.zeros(2, dtype=np.int32), KEPLER_DEFAULT_BITMASK)
+        _flux_stats(time, np.zeros(2, dtype=flux_dtype))
+
+
+def read_fits_metadata(fits_path) -> Dict:
+    """
+    Light curve summary from the FITS headers plus the memmapped TIME,
+    flux and quality columns, without building a lightkurve object.
+    Counts follow the same cadence filtering as read_fits_light_curve().
+    Uses a Numba kernel when numba is installed, NumPy otherwise.
+    
+    Returns:
+        Dictionary with kepid, flux_type, flux_points, valid_points and duration_days
+    """
+    with fits.open(fits_path, memmap=True, mode='readonly') as hdul:
+        hdu = hdul[1]
+        names = tuple(hdu.columns.names)
+        flux_col = _resolve_flux_column(names)
+        if flux_col is None:
+            raise ValueError("Could not extract flux data from light curve")
+        
+        kepid = hdul[0].header.get('KEPLERID')
+        n_rows = hdu.header['NAXIS2']
+        
+        data = hdu.data
+        time = data['TIME']
+        flux = data[flux_col]
+        
+        lower_map = {c.lower(): c for c in names}
+        quality_col = next((lower_map[n] for n in QUALITY_COLUMNS if n in lower_map), None)
+        
+        if njit is not None:
+            # One fused pass; the kernel needs native-endian contiguous columns
+            quality = (
+                np.zeros(n_rows, dtype=np.int32) if quality_col is None
+                else np.ascontiguousarray(data[quality_col], dtype=np.int32)
+            )
+            flux_points, valid_points, first, last = _cadence_summary(
+                np.ascontiguousarray(time, dtype=np.float64),
+                _native(flux),
+                quality,
+                KEPLER_DEFAULT_BITMASK
+            )
+            duration_days = float(last - first) if flux_points else None
+        else:
+            keep = ~np.isnan(time)
+            if quality_col is not None:
+                keep &= (data[quality_col] & KEPLER_DEFAULT_BITMASK) == 0
+            
+            kept = np.flatnonzero(keep)
+            flux_points = int(kept.size)
+            if flux_points == n_rows:
+                valid_points = int(np.count_nonzero(~np.isnan(flux)))
+            else:
+                valid_points = int(np.count_nonzero(~np.isnan(flux[kept])))
+            
+            # TIME is monotonic in Kepler/TESS products, so the span is last - first kept cadence
+            duration_days = float(time[kept[-1]] - time[kept[0]]) if flux_points else None
+    
+    return {
+        'kepid': int(kepid) if kepid is not None else None,
+        'flux_type': flux_col.upper(),
+        'flux_points': flux_points,
+        'valid_points': valid_points,
+        'duration_days': duration_days,
+    }
@@ -2,16 +2,24 @@
 Core utilities for loading the trained model and making predictions
 """
 import os
+import math
+import queue
+import threading
 import time
 import numpy as np
 import torch
 import torch.nn as nn
 import joblib
-import lightkurve as lk
 from pathlib import Path
 from typing import Dict, Tuple, Optional, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 import re
 
+from .cache_utils import get_flux_cache
+from .constants import CLASS_NAMES, PROBABILITY_KEYS
+from .flux_utils import read_fits_light_curve, read_fits_metadata
+
 
 # Model architecture (same as training notebook)
 class HybridExoNet(nn.Module):
@@ -64,14 +72,95 @@ class HybridExoNet(nn.Module):
         return out
 
 
+def select_device(device: Optional[str] = None) -> torch.device:
+    """The requested torch device, or MPS, then CUDA, then CPU when None"""
+    if device is not None:
+        return torch.device(device)
+    if torch.backends.mps.is_available():
+        return torch.device("mps")
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    return torch.device("cpu")
+
+
+class InferenceBatcher:
+    """
+    Coalesces concurrent single-sample forward passes into one batched call.
+    
+    Callers announce themselves with begin() before reading their FITS file,
+    then block in submit(). A daemon thread takes the first queued sample and
+    keeps collecting for up to window_ms, but only while other callers are
+    still preparing inputs, so a lone request never waits.
+    """
+    
+    def __init__(self, forward, max_batch: int = 32, window_ms: float = 20.0):
+        self._forward = forward
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+        self._queue = queue.Queue()
+        self._preparing = 0
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def begin(self):
+        """Register a caller that will submit() shortly"""
+        with self._lock:
+            self._preparing += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name='inference-batcher', daemon=True)
+                self._thread.start()
+    
+    def cancel(self):
+        """Undo begin() for a caller that failed before submitting"""
+        with self._lock:
+            self._preparing -= 1
+    
+    def submit(self, flux: np.ndarray, tab: np.ndarray) -> np.ndarray:
+        """Queue one (seq_len,) flux / (tab_dim,) feature pair and wait for its probabilities"""
+        future = Future()
+        with self._lock:
+            self._preparing -= 1
+            self._queue.put((flux, tab, future))
+        return future.result()
+    
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if self._preparing <= 0 or remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _worker(self):
+        while True:
+            batch = self._collect()
+            try:
+                probs = self._forward(
+                    np.stack([item[0] for item in batch]),
+                    np.stack([item[1] for item in batch])
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, _, future), row in zip(batch, probs):
+                future.set_result(row)
+
+
 class ExoplanetPredictor:
     """Main predictor class for inference"""
     
-    CLASS_NAMES = {
-        0: 'FALSE POSITIVE',
-        1: 'CANDIDATE',
-        2: 'CONFIRMED'
-    }
+    CLASS_NAMES = CLASS_NAMES
     
     def __init__(
         self,
@@ -79,7 +168,12 @@ class ExoplanetPredictor:
         scaler_path: str,
         features_path: str,
         seq_len: int = 2000,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        quantize: bool = False,
+        backend: str = 'torch',
+        batch_window_ms: float = 0.0,
+        cpu_bf16: bool = False,
+        cuda_amp: bool = False
     ):
         """
         Initialize the predictor
@@ -90,20 +184,21 @@ class ExoplanetPredictor:
             features_path: Path to feature list joblib file
             seq_len: Sequence length for light curves
             device: 'cuda', 'mps', 'cpu', or None (auto-detect)
+            quantize: Use dynamic INT8 quantization for the Linear layers (CPU only)
+            backend: 'torch', or 'onnx' to run an exported copy of the model under
+                     ONNX Runtime (requires onnxruntime)
+            batch_window_ms: If > 0, concurrent predict() calls are micro-batched
+                             into one forward pass (see InferenceBatcher)
+            cpu_bf16: Run CPU inference under BF16 autocast when the CPU has native
+                      BF16 support (AVX512-BF16/AMX); ignored with quantize
+            cuda_amp: Run CUDA inference under autocast, in BF16 where the GPU
+                      supports it (Ampere and newer) and FP16 otherwise
         """
         self.seq_len = seq_len
         self.model_version = "v1.0"
         
         # Device selection
-        if device is None:
-            if torch.backends.mps.is_available():
-                self.device = torch.device("mps")
-            elif torch.cuda.is_available():
-                self.device = torch.device("cuda")
-            else:
-                self.device = torch.device("cpu")
-        else:
-            self.device = torch.device(device)
+        self.device = select_device(device)
         
         print(f"Using device: {self.device}")
         
@@ -111,6 +206,9 @@ class ExoplanetPredictor:
         self.scaler = joblib.load(scaler_path)
         self.feature_cols = joblib.load(features_path)
         self.tab_dim = len(self.feature_cols)
+        self._feat_idx = {c: i for i, c in enumerate(self.feature_cols)}
+        self._scaler_mean = self.scaler.mean_ if self.scaler.with_mean else 0.0
+        self._scaler_scale = self.scaler.scale_ if self.scaler.with_std else 1.0
         
         # Load model
         self.model = HybridExoNet(seq_len, self.tab_dim, num_classes=3)
@@ -118,77 +216,203 @@ class ExoplanetPredictor:
         self.model.to(self.device)
         self.model.eval()
         
+        # ONNX Runtime replaces the torch forward entirely when requested
+        self.ort_session = None
+        if backend == 'onnx':
+            self.ort_session = self._load_onnx_session(model_path)
+        
+        # Dynamic INT8 on CPU; Conv1d has no dynamic kernel so the CNN stays FP32
+        if quantize and self.device.type == 'cpu' and self.ort_session is None:
+            self.model = torch.ao.quantization.quantize_dynamic(self.model, {nn.Linear}, dtype=torch.qint8)
+            self.model_version += "-int8"
+        
+        # Autocast on CUDA, and on CPUs with native BF16, only when asked; otherwise FP32
+        self._autocast_dtype = None
+        if cuda_amp and self.ort_session is None and self.device.type == 'cuda':
+            if torch.cuda.is_bf16_supported():
+                self._autocast_dtype = torch.bfloat16
+                self.model_version += "-bf16"
+            else:
+                self._autocast_dtype = torch.float16
+                self.model_version += "-fp16"
+        elif (cpu_bf16 and not quantize and self.ort_session is None and self.device.type == 'cpu'
+              and torch.ops.mkldnn._is_mkldnn_bf16_supported()):
+            self._autocast_dtype = torch.bfloat16
+            self.model_version += "-bf16"
+        
+        self._eager_model = self.model
+        if self.ort_session is None:
+            self.model = self._optimize_model(self.model)
+        self._warmup()
+        
+        self.batcher = InferenceBatcher(self._forward, window_ms=batch_window_ms) if batch_window_ms > 0 else None
+        
         print(f"Model loaded: {len(self.feature_cols)} features, seq_len={seq_len}")
     
+    def _dummy_inputs(self, batch: int = 1) -> Tuple[torch.Tensor, torch.Tensor]:
+        return (
+            torch.ones(batch, 1, self.seq_len, device=self.device),
+            torch.zeros(batch, self.tab_dim, device=self.device),
+        )
+    
+    def _optimize_model(self, model: nn.Module) -> nn.Module:
+        """
+        Compile the model on CUDA and trace it on MPS. On CPU the FP32 model is
+        traced and frozen (weights folded in as constants); Inductor is skipped
+        there because it is slower than eager for this small network and adds
+        ~30 s of compilation to every worker boot.
+        """
+        try:
+            if self.device.type == 'cuda':
+                return torch.compile(model, mode="reduce-overhead", fullgraph=True)
+            if self.device.type == 'mps':
+                with torch.inference_mode():
+                    return torch.jit.trace(model, self._dummy_inputs())
+            if self.device.type == 'cpu' and self._autocast_dtype is None:
+                with torch.inference_mode():
+                    return torch.jit.freeze(torch.jit.trace(model, self._dummy_inputs()))
+        except Exception as e:
+            print(f"Model optimization skipped: {e}")
+        return model
+    
+    def _load_onnx_session(self, model_path: str):
+        """
+        Export the model to ONNX next to the .pth (re-exported when the
+        weights are newer) and open an optimized ONNX Runtime session.
+        Returns None, falling back to torch, if either step fails.
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            print("onnxruntime not installed, using torch backend")
+            return None
+        
+        onnx_path = Path(model_path).with_suffix('.onnx')
+        try:
+            if not onnx_path.exists() or onnx_path.stat().st_mtime < os.path.getmtime(model_path):
+                dummy_lc, dummy_tab = (t.cpu() for t in self._dummy_inputs())
+                torch.onnx.export(
+                    self.model.cpu(), (dummy_lc, dummy_tab), str(onnx_path),
+                    input_names=['lc', 'tab'], output_names=['logits'],
+                    dynamic_axes={'lc': {0: 'B'}, 'tab': {0: 'B'}, 'logits': {0: 'B'}},
+                    opset_version=17, dynamo=False
+                )
+                self.model.to(self.device)
+            
+            sess_options = ort.SessionOptions()
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            sess_options.enable_cpu_mem_arena = True
+            
+            available = ort.get_available_providers()
+            providers = ['CPUExecutionProvider']
+            if self.device.type == 'cuda' and 'CUDAExecutionProvider' in available:
+                providers.insert(0, 'CUDAExecutionProvider')
+            
+            session = ort.InferenceSession(str(onnx_path), sess_options, providers=providers)
+            self.model_version += "-onnx"
+            return session
+        except Exception as e:
+            self.model.to(self.device)
+            print(f"ONNX export failed, using torch backend: {e}")
+            return None
+    
+    def _warmup(self):
+        """Run one dummy forward so graph capture doesn't land on the first request"""
+        if self.ort_session is not None:
+            self._forward(np.ones((1, self.seq_len), dtype=np.float32), np.zeros((1, self.tab_dim), dtype=np.float32))
+            return
+        
+        lc_tensor, tab_tensor = self._dummy_inputs()
+        try:
+            # The JIT profiling executor and CUDA graphs both specialize over the first few calls
+            for _ in range(3):
+                self._run_model(lc_tensor, tab_tensor)
+        except Exception as e:
+            # Compilation errors only surface on first call; fall back to eager
+            print(f"Model optimization failed, using eager mode: {e}")
+            self.model = self._eager_model
+            self._run_model(lc_tensor, tab_tensor)
+    
+    def _run_model(self, lc_tensor: torch.Tensor, tab_tensor: torch.Tensor) -> np.ndarray:
+        with torch.inference_mode():
+            if self._autocast_dtype is not None:
+                with torch.autocast(device_type=self.device.type, dtype=self._autocast_dtype):
+                    logits = self.model(lc_tensor, tab_tensor)
+            else:
+                logits = self.model(lc_tensor, tab_tensor)
+            return torch.softmax(logits.float(), dim=1).cpu().numpy()
+    
     def process_light_curve(
         self,
-        fits_path: str,
-        cache_dir: Optional[str] = None
+        fits_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        out: Optional[np.ndarray] = None,
+        light_curve: Optional[Dict] = None
     ) -> np.ndarray:
         """
         Process FITS file into normalized flux array
         
         Args:
             fits_path: Path to FITS file
-            cache_dir: Optional cache directory for .npy files
+            cache_dir: Optional directory for the packed flux cache
+            out: Optional float32 buffer of length seq_len to write into
+                 (e.g. a row of a preallocated batch)
+            light_curve: Optional read_fits_light_curve() result already in
+                 memory; the FITS file is then not opened again
             
         Returns:
-            Normalized flux array of length seq_len
+            Normalized flux array of length seq_len (``out`` if given)
         """
+        if out is None:
+            out = np.empty(self.seq_len, dtype=np.float32)
+        
         # Check cache first
-        if cache_dir:
+        flux_cache = None
+        base_match = None
+        if cache_dir and fits_path:
             base_match = re.search(r'(\d{6,9})', os.path.basename(fits_path))
             if base_match:
-                cache_path = os.path.join(cache_dir, f"{base_match.group(1)}.npy")
-                if os.path.exists(cache_path):
-                    return np.load(cache_path)
+                flux_cache = get_flux_cache(cache_dir, self.seq_len)
+                if flux_cache.get(base_match.group(1), out=out) is not None:
+                    return out
         
-        # Read FITS file
+        # Read flux column straight from the FITS table (prefer PDCSAP_FLUX)
         try:
-            lc = lk.read(fits_path)
+            if light_curve is None:
+                light_curve = read_fits_light_curve(fits_path)
+            arr = light_curve['flux']
         except Exception as e:
             print(f"Error reading {fits_path}: {e}")
-            return np.ones(self.seq_len, dtype=np.float32)
-        
-        # Extract flux (prefer PDCSAP_FLUX)
-        arr = None
-        try:
-            if hasattr(lc, "PDCSAP_FLUX") and lc.PDCSAP_FLUX is not None:
-                arr = lc.PDCSAP_FLUX.value
-            elif hasattr(lc, "SAP_FLUX") and lc.SAP_FLUX is not None:
-                arr = lc.SAP_FLUX.value
-            else:
-                arr = getattr(lc, "flux", None)
-                if arr is None:
-                    arr = np.zeros(self.seq_len)
-        except Exception:
-            arr = np.zeros(self.seq_len)
-        
-        arr = np.asarray(arr, dtype=np.float32)
-        
-        # Normalize
-        if np.all(np.isnan(arr)) or np.nanmax(np.abs(arr)) == 0:
-            arr = np.ones(self.seq_len, dtype=np.float32)
-        else:
-            med = np.nanmedian(arr)
-            if not np.isfinite(med) or med == 0:
+            out.fill(1.0)
+            return out
+        
+        arr = np.asarray(arr, dtype=np.float32).ravel()
+        
+        # Normalize and pad/truncate in one pass over the kept samples
+        out.fill(1.0)
+        finite = arr[np.isfinite(arr)]
+        if finite.size and np.any(finite):
+            # Median by in-place introselect on the already-copied finite values
+            k = finite.size // 2
+            finite.partition(k)
+            med = finite[k] if finite.size % 2 else (finite[k] + finite[:k].max()) / np.float32(2)
+            if med == 0:
                 med = 1.0
-            arr = np.nan_to_num(arr / med, nan=0.0, posinf=0.0, neginf=0.0)
-        
-        # Pad/truncate
-        if len(arr) < self.seq_len:
-            padded = np.ones(self.seq_len, dtype=np.float32)
-            padded[:len(arr)] = arr
-            arr = padded
-        else:
-            arr = arr[:self.seq_len]
+            n = min(arr.size, self.seq_len)
+            scaled = arr[:n] / med
+            out[:n] = np.where(np.isfinite(scaled), scaled, 0.0)
         
         # Cache if requested
-        if cache_dir and base_match:
-            os.makedirs(cache_dir, exist_ok=True)
-            np.save(cache_path, arr)
+        if flux_cache is not None:
+            flux_cache.put(base_match.group(1), out)
         
-        return arr
+        return out
+    
+    def _alloc_flux_batch(self, batch_size: int) -> np.ndarray:
+        """(batch_size, seq_len) flux buffer; page-locked on CUDA for async copies"""
+        if self.device.type == 'cuda':
+            return torch.empty((batch_size, self.seq_len), dtype=torch.float32, pin_memory=True).numpy()
+        return np.empty((batch_size, self.seq_len), dtype=np.float32)
     
     def prepare_tabular_features(self, koi_params: Dict[str, float]) -> np.ndarray:
         """
@@ -200,26 +424,35 @@ class ExoplanetPredictor:
         Returns:
             Scaled feature array
         """
-        # Build feature vector in correct order
-        features = []
-        for col in self.feature_cols:
-            val = koi_params.get(col, np.nan)
-            if val is None or (isinstance(val, float) and np.isnan(val)):
-                # Use median from training data (which is 0 after scaling)
-                val = 0.0
-            features.append(float(val))
-        
-        features = np.array(features, dtype=np.float32).reshape(1, -1)
-        
-        # Scale
-        features_scaled = self.scaler.transform(features)
-        return features_scaled[0]
+        return self.prepare_tabular_batch([koi_params])[0]
+    
+    def prepare_tabular_batch(self, koi_params_list: List[Optional[Dict[str, float]]]) -> np.ndarray:
+        """
+        Prepare and scale tabular features for a batch of KOI parameter dicts
+        
+        Returns:
+            (B, tab_dim) scaled feature array
+        """
+        # Missing values use the training median (which is 0 after scaling)
+        features = np.zeros((len(koi_params_list), self.tab_dim), dtype=np.float64)
+        for i, koi_params in enumerate(koi_params_list):
+            for key, val in (koi_params or {}).items():
+                j = self._feat_idx.get(key)
+                if j is None or val is None:
+                    continue
+                val = float(val)
+                if not math.isnan(val):
+                    features[i, j] = val
+        
+        # Apply the StandardScaler parameters directly, skipping sklearn's per-call validation
+        return ((features - self._scaler_mean) / self._scaler_scale).astype(np.float32)
     
     def predict(
         self,
-        fits_path: str,
+        fits_path: Optional[str] = None,
         koi_params: Optional[Dict[str, float]] = None,
-        cache_dir: Optional[str] = None
+        cache_dir: Optional[str] = None,
+        light_curve: Optional[Dict] = None
     ) -> Dict:
         """
         Make a prediction on a single FITS file
@@ -228,48 +461,85 @@ class ExoplanetPredictor:
             fits_path: Path to FITS file
             koi_params: Optional dictionary of KOI parameters
             cache_dir: Optional cache directory
+            light_curve: Optional read_fits_light_curve() result for a file
+                the caller has already read
             
         Returns:
             Dictionary with prediction results
         """
+        if fits_path is None and light_curve is None:
+            raise ValueError("predict() needs a fits_path or a light_curve")
+        
         start_time = time.time()
         
-        # Process light curve
-        flux = self.process_light_curve(fits_path, cache_dir)
+        if self.batcher is not None:
+            self.batcher.begin()
+        try:
+            # Process light curve
+            flux = self.process_light_curve(fits_path, cache_dir, light_curve=light_curve)
+            
+            # Prepare tabular features (use zeros if not provided)
+            if koi_params is None:
+                koi_params = {}
+            tab_features = self.prepare_tabular_features(koi_params)
+        except Exception:
+            if self.batcher is not None:
+                self.batcher.cancel()
+            raise
         
-        # Prepare tabular features (use zeros if not provided)
-        if koi_params is None:
-            koi_params = {}
-        tab_features = self.prepare_tabular_features(koi_params)
+        if self.batcher is not None:
+            # Shares a forward pass with any requests arriving at the same time
+            probs = self.batcher.submit(flux, tab_features)
+        else:
+            probs = self._forward(flux[np.newaxis, :], tab_features[np.newaxis, :])[0]
         
-        # Convert to tensors
-        lc_tensor = torch.from_numpy(flux).float().unsqueeze(0).unsqueeze(0)  # (1, 1, seq_len)
-        tab_tensor = torch.from_numpy(tab_features).float().unsqueeze(0)  # (1, tab_dim)
+        processing_time_ms = int((time.time() - start_time) * 1000)
         
-        # Move to device
-        lc_tensor = lc_tensor.to(self.device)
-        tab_tensor = tab_tensor.to(self.device)
+        return self._format_result(probs, koi_params, processing_time_ms)
+    
+    def _forward(self, flux_batch: np.ndarray, tab_batch: np.ndarray) -> np.ndarray:
+        """
+        Run the model on a stacked batch
         
-        # Inference
-        with torch.no_grad():
-            logits = self.model(lc_tensor, tab_tensor)
-            probs = torch.softmax(logits, dim=1).cpu().numpy()[0]
+        Args:
+            flux_batch: (B, seq_len) normalized flux arrays
+            tab_batch: (B, tab_dim) scaled tabular features
+            
+        Returns:
+            (B, num_classes) softmax probabilities
+        """
+        if self.ort_session is not None:
+            logits = self.ort_session.run(None, {
+                'lc': np.ascontiguousarray(flux_batch, dtype=np.float32)[:, np.newaxis, :],
+                'tab': np.ascontiguousarray(tab_batch, dtype=np.float32),
+            })[0]
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            return exp / exp.sum(axis=1, keepdims=True)
+        
+        lc_tensor = torch.from_numpy(np.ascontiguousarray(flux_batch, dtype=np.float32)).unsqueeze(1)  # (B, 1, seq_len)
+        tab_tensor = torch.from_numpy(np.ascontiguousarray(tab_batch, dtype=np.float32))  # (B, tab_dim)
+        
+        # Move to device (pinned so the copy can overlap on CUDA)
+        non_blocking = self.device.type == 'cuda'
+        if non_blocking:
+            lc_tensor = lc_tensor.pin_memory()
+            tab_tensor = tab_tensor.pin_memory()
+        lc_tensor = lc_tensor.to(self.device, non_blocking=non_blocking)
+        tab_tensor = tab_tensor.to(self.device, non_blocking=non_blocking)
         
-        # Get predicted class
+        # Inference
+        return self._run_model(lc_tensor, tab_tensor)
+    
+    def _format_result(self, probs: np.ndarray, koi_params: Dict, processing_time_ms: int) -> Dict:
+        """Build the prediction dictionary for one sample"""
         predicted_class = int(np.argmax(probs))
-        confidence = float(probs[predicted_class])
-        
-        processing_time_ms = int((time.time() - start_time) * 1000)
+        values = probs.tolist()
         
         return {
             'predicted_class': predicted_class,
             'predicted_class_name': self.CLASS_NAMES[predicted_class],
-            'probabilities': {
-                'FALSE_POSITIVE': float(probs[0]),
-                'CANDIDATE': float(probs[1]),
-                'CONFIRMED': float(probs[2]),
-            },
-            'confidence': confidence,
+            'probabilities': dict(zip(PROBABILITY_KEYS, values)),
+            'confidence': values[predicted_class],
             'processing_time_ms': processing_time_ms,
             'model_version': self.model_version,
             'features_used': koi_params,
@@ -299,79 +569,113 @@ class ExoplanetPredictor:
         
         results = []
         
-        for i in range(0, len(fits_paths), batch_size):
-            batch_fits = fits_paths[i:i+batch_size]
-            batch_params = koi_params_list[i:i+batch_size]
+        batches = [
+            (fits_paths[i:i+batch_size], koi_params_list[i:i+batch_size])
+            for i in range(0, len(fits_paths), batch_size)
+        ]
+        
+        # Two flux buffers: one being filled by the prefetch, one in the forward pass
+        buffers = [self._alloc_flux_batch(min(batch_size, len(fits_paths))) for _ in range(min(2, len(batches)))]
+        
+        # FITS reads are I/O bound, so prepare batches on a few threads
+        with ThreadPoolExecutor(max_workers=min(batch_size, 8)) as executor:
+            def submit(b):
+                buf = buffers[b % 2]
+                return [
+                    executor.submit(self.process_light_curve, p, cache_dir, buf[j])
+                    for j, p in enumerate(batches[b][0])
+                ]
+            
+            pending = submit(0) if batches else None
             
-            for fits_path, koi_params in zip(batch_fits, batch_params):
-                try:
-                    result = self.predict(fits_path, koi_params, cache_dir)
-                    result['fits_path'] = fits_path
-                    result['success'] = True
-                except Exception as e:
-                    result = {
-                        'fits_path': fits_path,
-                        'success': False,
-                        'error': str(e)
-                    }
-                results.append(result)
+            for b, (batch_fits, batch_params) in enumerate(batches):
+                start_time = time.time()
+                futures = pending
+                
+                # Queue the next batch now so its FITS reads overlap this forward pass
+                pending = submit(b + 1) if b + 1 < len(batches) else None
+                
+                batch_results = []
+                ready = []
+                for j, (fits_path, koi_params, future) in enumerate(zip(batch_fits, batch_params, futures)):
+                    try:
+                        future.result()
+                        ready.append((len(batch_results), j))
+                        batch_results.append({'fits_path': fits_path, 'features_used': koi_params})
+                    except Exception as e:
+                        batch_results.append({
+                            'fits_path': fits_path,
+                            'success': False,
+                            'error': str(e)
+                        })
+                
+                if ready:
+                    try:
+                        buf = buffers[b % 2]
+                        rows = [j for _, j in ready]
+                        flux_batch = buf[:len(rows)] if len(rows) == len(batch_fits) else buf[rows]
+                        probs = self._forward(
+                            flux_batch,
+                            self.prepare_tabular_batch([batch_results[pos]['features_used'] for pos, _ in ready])
+                        )
+                        processing_time_ms = int((time.time() - start_time) * 1000 / len(ready))
+                        for (pos, _), row in zip(ready, probs):
+                            entry = batch_results[pos]
+                            result = self._format_result(row, entry['features_used'], processing_time_ms)
+                            result['fits_path'] = entry['fits_path']
+                            result['success'] = True
+                            batch_results[pos] = result
+                    except Exception as e:
+                        for pos, _ in ready:
+                            batch_results[pos] = {
+                                'fits_path': batch_results[pos]['fits_path'],
+                                'success': False,
+                                'error': str(e)
+                            }
+                
+                results.extend(batch_results)
         
         return results
 
 
 def extract_light_curve_metadata(fits_path: str) -> Dict:
     """
-    Extract metadata from FITS file
+    Extract metadata from FITS file. Results are cached per path, size and
+    mtime, so repeat predictions on the same file skip the FITS read.
     
     Returns:
         Dictionary with metadata (duration, points, gaps, etc.)
     """
     try:
-        lc = lk.read(fits_path)
-        
-        # Get flux
-        if hasattr(lc, "PDCSAP_FLUX") and lc.PDCSAP_FLUX is not None:
-            flux = lc.PDCSAP_FLUX.value
-            flux_type = 'PDCSAP_FLUX'
-        elif hasattr(lc, "SAP_FLUX") and lc.SAP_FLUX is not None:
-            flux = lc.SAP_FLUX.value
-            flux_type = 'SAP_FLUX'
-        else:
-            flux = None
-            flux_type = 'unknown'
-        
-        if flux is not None:
-            flux_points = len(flux)
-            valid_points = np.sum(~np.isnan(flux))
-            gaps_detected = flux_points - valid_points
-            
-            # Get time range
-            if hasattr(lc, 'time'):
-                time_array = lc.time.value
-                duration_days = float(np.nanmax(time_array) - np.nanmin(time_array))
-            else:
-                duration_days = None
-            
-            # Data quality score (fraction of valid points)
-            data_quality_score = valid_points / flux_points if flux_points > 0 else 0.0
-        else:
-            flux_points = None
-            duration_days = None
-            gaps_detected = None
-            data_quality_score = 0.0
+        stat = os.stat(fits_path)
+    except OSError:
+        return _extract_light_curve_metadata(fits_path)
+    # Copy so callers can't alter the cached entry
+    return dict(_cached_light_curve_metadata(os.fspath(fits_path), stat.st_size, stat.st_mtime_ns))
+
+
+@lru_cache(maxsize=1024)
+def _cached_light_curve_metadata(fits_path: str, size: int, mtime_ns: int) -> Dict:
+    """size and mtime_ns only key the cache, so a rewritten file is read again"""
+    return _extract_light_curve_metadata(fits_path)
+
+
+def _extract_light_curve_metadata(fits_path: str) -> Dict:
+    try:
+        meta = read_fits_metadata(fits_path)
+        flux_points = meta['flux_points']
+        valid_points = meta['valid_points']
         
-        # Try to extract KepID
-        kepid = None
-        if hasattr(lc, 'meta') and 'KEPLERID' in lc.meta:
-            kepid = int(lc.meta['KEPLERID'])
+        # Data quality score (fraction of valid points)
+        data_quality_score = valid_points / flux_points if flux_points > 0 else 0.0
         
         return {
-            'kepid': kepid,
+            'kepid': meta['kepid'],
             'flux_points': flux_points,
-            'duration_days': duration_days,
-            'gaps_detected': gaps_detected,
+            'duration_days': meta['duration_days'],
+            'gaps_detected': flux_points - valid_points,
             'data_quality_score': data_quality_score,
-            'flux_type': flux_type,
+            'flux_type': meta['flux_type'],
         }
     
     except Exception as e:
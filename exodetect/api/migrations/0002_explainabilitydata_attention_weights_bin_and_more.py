@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-14 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='explainabilitydata',
+            name='attention_weights_bin',
+            field=models.BinaryField(blank=True, help_text='zlib-compressed float32 attention scores', null=True),
+        ),
+        migrations.AddField(
+            model_name='explainabilitydata',
+            name='gradcam_heatmap_bin',
+            field=models.BinaryField(blank=True, help_text='zlib-compressed float32 Grad-CAM heatmap', null=True),
+        ),
+        migrations.AlterField(
+            model_name='explainabilitydata',
+            name='attention_weights',
+            field=models.JSONField(blank=True, help_text='Attention scores across time (legacy, see attention_weights_bin)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='explainabilitydata',
+            name='gradcam_heatmap',
+            field=models.JSONField(blank=True, help_text='1D array of attention weights (legacy, see gradcam_heatmap_bin)', null=True),
+        ),
+    ]
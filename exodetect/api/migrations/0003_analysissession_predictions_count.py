@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-14 10:12
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_predictions_count(apps, schema_editor):
+    AnalysisSession = apps.get_model('api', 'AnalysisSession')
+    Prediction = apps.get_model('api', 'Prediction')
+    counts = (
+        Prediction.objects.filter(session=OuterRef('pk'))
+        .order_by()
+        .values('session')
+        .annotate(n=Count('id'))
+        .values('n')
+    )
+    AnalysisSession.objects.update(
+        predictions_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_explainabilitydata_attention_weights_bin_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='predictions_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_predictions_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-14 10:13
+
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """CREATE INDEX CONCURRENTLY on PostgreSQL (no table lock), plain CREATE INDEX elsewhere"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.remove_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, self.index)
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0003_analysissession_predictions_count'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='prediction',
+            index=models.Index(fields=['session', '-created_at'], name='pred_session_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='prediction',
+            index=models.Index(condition=models.Q(('confidence__gte', 0.9)), fields=['predicted_class_name', '-created_at'], name='pred_high_conf_idx'),
+        ),
+    ]
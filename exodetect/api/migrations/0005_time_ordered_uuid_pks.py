@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-14 10:16
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_prediction_session_and_high_conf_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lightcurvefile',
+            name='id',
+            field=models.UUIDField(default=api.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='prediction',
+            name='id',
+            field=models.UUIDField(default=api.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='transitdetection',
+            name='id',
+            field=models.UUIDField(default=api.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-14 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_database_side_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lightcurvefile',
+            name='content_sha256',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the uploaded file, used to dedupe repeat uploads', max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='prediction',
+            name='features_key',
+            field=models.CharField(blank=True, editable=False, help_text='koi_features_key() of the KOI parameters used', max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(fields=['light_curve', 'features_key', 'model_version'], name='pred_reuse_idx'),
+        ),
+    ]
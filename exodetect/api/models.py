@@ -5,18 +5,63 @@ Stores predictions, user uploads, analysis sessions, and feedback
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator
+from django.db.models.functions import Now
+import os
+import json
+import time
+import hashlib
 import uuid
+import zlib
+import numpy as np
+
+from .constants import CLASS_NAMES, PROBABILITY_KEYS
+
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit Unix ms timestamp
+    followed by random bits, so new rows land at the end of the PK index.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    # Set version (0111) and variant (10) bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return uuid.UUID(int=value)
+
+
+def koi_features_key(koi_params):
+    """Stable SHA-256 of the KOI parameters a prediction was made with"""
+    payload = json.dumps(koi_params or {}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def pack_float_array(values):
+    """Encode a 1D array as zlib-compressed float32 bytes"""
+    if values is None:
+        return None
+    return zlib.compress(np.ascontiguousarray(values, dtype=np.float32).tobytes(), 1)
+
+
+def unpack_float_array(blob):
+    """Decode bytes written by pack_float_array() into a read-only float32 array"""
+    if blob is None:
+        return None
+    return np.frombuffer(zlib.decompress(blob), dtype=np.float32)
 
 
 class LightCurveFile(models.Model):
     """Stores uploaded FITS light curve files"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     file = models.FileField(
         upload_to='lightcurves/%Y/%m/%d/',
         validators=[FileExtensionValidator(allowed_extensions=['fits', 'fit', 'fits.gz'])]
     )
     kepid = models.IntegerField(null=True, blank=True, db_index=True)
-    uploaded_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    content_sha256 = models.CharField(
+        max_length=64, null=True, blank=True, unique=True, editable=False,
+        help_text="SHA-256 of the uploaded file, used to dedupe repeat uploads"
+    )
+    uploaded_at = models.DateTimeField(db_default=Now(), editable=False, db_index=True)
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     
     # Metadata extracted from FITS file
@@ -68,7 +113,7 @@ class KOIParameters(models.Model):
     koi_pdisposition = models.CharField(max_length=20, null=True, blank=True, help_text="Pipeline disposition")
     koi_disposition = models.CharField(max_length=20, null=True, blank=True, help_text="Final disposition")
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -84,10 +129,13 @@ class AnalysisSession(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=200, default="Untitled Session")
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     notes = models.TextField(blank=True)
     
+    # Denormalized count of predictions in this session, kept in sync by api.signals
+    predictions_count = models.IntegerField(default=0)
+    
     class Meta:
         ordering = ['-updated_at']
     
@@ -98,13 +146,9 @@ class AnalysisSession(models.Model):
 class Prediction(models.Model):
     """Stores model predictions and results"""
     
-    CLASS_CHOICES = [
-        (0, 'FALSE POSITIVE'),
-        (1, 'CANDIDATE'),
-        (2, 'CONFIRMED'),
-    ]
+    CLASS_CHOICES = list(enumerate(CLASS_NAMES))
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     
     # Input data
     light_curve = models.ForeignKey(LightCurveFile, on_delete=models.CASCADE, related_name='predictions')
@@ -123,8 +167,12 @@ class Prediction(models.Model):
     
     # Metadata
     model_version = models.CharField(max_length=50, default="v1.0")
+    features_key = models.CharField(
+        max_length=64, null=True, blank=True, editable=False,
+        help_text="koi_features_key() of the KOI parameters used"
+    )
     processing_time_ms = models.IntegerField(help_text="Inference time in milliseconds")
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False, db_index=True)
     
     # For batch predictions
     batch_id = models.UUIDField(null=True, blank=True, db_index=True)
@@ -134,17 +182,39 @@ class Prediction(models.Model):
         indexes = [
             models.Index(fields=['predicted_class', 'confidence']),
             models.Index(fields=['batch_id', 'created_at']),
+            models.Index(fields=['session', '-created_at'], name='pred_session_created_idx'),
+            models.Index(fields=['light_curve', 'features_key', 'model_version'], name='pred_reuse_idx'),
+            models.Index(
+                fields=['predicted_class_name', '-created_at'],
+                condition=models.Q(confidence__gte=0.9),
+                name='pred_high_conf_idx'
+            ),
         ]
     
+    # Columns PredictionSerializer reads; koi_params and features_key are left out
+    LIST_FIELDS = (
+        'id', 'light_curve', 'session', 'predicted_class', 'predicted_class_name',
+        'prob_false_positive', 'prob_candidate', 'prob_confirmed', 'confidence',
+        'model_version', 'processing_time_ms', 'created_at', 'batch_id'
+    )
+    
     def __str__(self):
         return f"Prediction {self.predicted_class_name} ({self.confidence:.2f})"
     
-    def get_probabilities_dict(self):
+    def as_result(self):
+        """This prediction in the dict format returned by ExoplanetPredictor.predict()"""
         return {
-            'FALSE_POSITIVE': float(self.prob_false_positive),
-            'CANDIDATE': float(self.prob_candidate),
-            'CONFIRMED': float(self.prob_confirmed),
+            'predicted_class': self.predicted_class,
+            'predicted_class_name': self.predicted_class_name,
+            'probabilities': self.get_probabilities_dict(),
+            'confidence': self.confidence,
+            'processing_time_ms': self.processing_time_ms,
+            'model_version': self.model_version,
         }
+    
+    def get_probabilities_dict(self):
+        # FloatField values are already Python floats
+        return dict(zip(PROBABILITY_KEYS, (self.prob_false_positive, self.prob_candidate, self.prob_confirmed)))
 
 
 class ExplainabilityData(models.Model):
@@ -153,23 +223,62 @@ class ExplainabilityData(models.Model):
     prediction = models.OneToOneField(Prediction, on_delete=models.CASCADE, related_name='explanation')
     
     # Grad-CAM data
-    gradcam_heatmap = models.JSONField(null=True, blank=True, help_text="1D array of attention weights")
+    gradcam_heatmap = models.JSONField(null=True, blank=True, help_text="1D array of attention weights (legacy, see gradcam_heatmap_bin)")
+    gradcam_heatmap_bin = models.BinaryField(null=True, blank=True, help_text="zlib-compressed float32 Grad-CAM heatmap")
     
     # Feature importance (SHAP values)
     shap_values = models.JSONField(null=True, blank=True, help_text="Dict of feature: SHAP value")
     feature_importance = models.JSONField(null=True, blank=True, help_text="Dict of feature: importance score")
     
     # Attention weights from model
-    attention_weights = models.JSONField(null=True, blank=True, help_text="Attention scores across time")
+    attention_weights = models.JSONField(null=True, blank=True, help_text="Attention scores across time (legacy, see attention_weights_bin)")
+    attention_weights_bin = models.BinaryField(null=True, blank=True, help_text="zlib-compressed float32 attention scores")
     
     # Uncertainty estimates
     uncertainty_epistemic = models.FloatField(null=True, blank=True, help_text="Model uncertainty")
     uncertainty_aleatoric = models.FloatField(null=True, blank=True, help_text="Data uncertainty")
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+    
+    # Columns list views need; the heatmap/attention/SHAP payloads are left out
+    LIST_FIELDS = (
+        'id', 'prediction_id', 'uncertainty_epistemic', 'uncertainty_aleatoric', 'created_at'
+    )
     
     def __str__(self):
-        return f"Explanation for {self.prediction.id}"
+        return f"Explanation for {self.prediction_id}"
+    
+    def _get_array(self, name):
+        # Rows written before the binary columns existed only have the JSON copy
+        blob = getattr(self, f'{name}_bin')
+        if blob is not None:
+            return unpack_float_array(bytes(blob))
+        values = getattr(self, name)
+        if values is not None:
+            return np.asarray(values, dtype=np.float32)
+        return None
+    
+    def _set_array(self, name, values):
+        setattr(self, f'{name}_bin', pack_float_array(values))
+        setattr(self, name, None)
+    
+    @property
+    def gradcam(self):
+        """Grad-CAM heatmap as a float32 array (None if missing)"""
+        return self._get_array('gradcam_heatmap')
+    
+    @gradcam.setter
+    def gradcam(self, values):
+        self._set_array('gradcam_heatmap', values)
+    
+    @property
+    def attention(self):
+        """Attention weights as a float32 array (None if missing)"""
+        return self._get_array('attention_weights')
+    
+    @attention.setter
+    def attention(self, values):
+        self._set_array('attention_weights', values)
 
 
 class UserFeedback(models.Model):
@@ -181,11 +290,7 @@ class UserFeedback(models.Model):
         ('uncertain', 'Uncertain'),
     ]
     
-    CORRECTED_CLASS_CHOICES = [
-        (0, 'FALSE POSITIVE'),
-        (1, 'CANDIDATE'),
-        (2, 'CONFIRMED'),
-    ]
+    CORRECTED_CLASS_CHOICES = list(enumerate(CLASS_NAMES))
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     prediction = models.ForeignKey(Prediction, on_delete=models.CASCADE, related_name='feedback')
@@ -199,7 +304,7 @@ class UserFeedback(models.Model):
         help_text="1-5 scale, how confident is the user in their correction"
     )
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     
     # Track if this feedback was used in retraining
     used_in_training = models.BooleanField(default=False)
@@ -214,7 +319,7 @@ class UserFeedback(models.Model):
 
 class TransitDetection(models.Model):
     """Stores detected transit events in light curves"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     light_curve = models.ForeignKey(LightCurveFile, on_delete=models.CASCADE, related_name='transits')
     
     # Transit characteristics
@@ -232,7 +337,7 @@ class TransitDetection(models.Model):
     is_anomaly = models.BooleanField(default=False, help_text="Flagged as potential artifact")
     detection_algorithm = models.CharField(max_length=50, default="BLS")
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     
     class Meta:
         ordering = ['start_time']
@@ -259,7 +364,7 @@ class BatchJob(models.Model):
     processed_files = models.IntegerField(default=0)
     failed_files = models.IntegerField(default=0)
     
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False, db_index=True)
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
@@ -313,7 +418,7 @@ class ModelMetrics(models.Model):
     # Metadata
     validation_set_size = models.IntegerField()
     training_date = models.DateTimeField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     
     class Meta:
         ordering = ['-created_at']
@@ -0,0 +1,35 @@
+"""
+JSON renderer backed by orjson for responses carrying large numeric arrays
+"""
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that serializes with orjson, including numpy arrays
+    and scalars, so light curve and periodogram payloads are encoded in C
+    rather than element by element. Types orjson doesn't know (Decimal, lazy
+    strings, ...) go through DRF's encoder. Falls back to the stock renderer
+    when orjson isn't installed or indented output was asked for.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=encoders.JSONEncoder().default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        # Same JavaScript-safe escaping of U+2028/U+2029 as JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -62,6 +62,9 @@ class PredictionSerializer(serializers.ModelSerializer):
 
 class ExplainabilityDataSerializer(serializers.ModelSerializer):
     """Serializer for explainability data"""
+    gradcam_heatmap = serializers.SerializerMethodField()
+    attention_weights = serializers.SerializerMethodField()
+    
     class Meta:
         model = ExplainabilityData
         fields = [
@@ -70,6 +73,14 @@ class ExplainabilityDataSerializer(serializers.ModelSerializer):
             'uncertainty_epistemic', 'uncertainty_aleatoric', 'created_at'
         ]
         read_only_fields = fields
+    
+    def get_gradcam_heatmap(self, obj):
+        values = obj.gradcam
+        return values.tolist() if values is not None else None
+    
+    def get_attention_weights(self, obj):
+        values = obj.attention
+        return values.tolist() if values is not None else None
 
 
 class UserFeedbackSerializer(serializers.ModelSerializer):
@@ -93,20 +104,15 @@ class TransitDetectionSerializer(serializers.ModelSerializer):
 
 class AnalysisSessionSerializer(serializers.ModelSerializer):
     """Serializer for analysis sessions"""
-    predictions_count = serializers.SerializerMethodField()
-    
     class Meta:
         model = AnalysisSession
         fields = ['id', 'name', 'created_at', 'updated_at', 'notes', 'predictions_count']
         read_only_fields = ['id', 'created_at', 'updated_at', 'predictions_count']
-    
-    def get_predictions_count(self, obj):
-        return obj.predictions.count()
 
 
 class BatchJobSerializer(serializers.ModelSerializer):
     """Serializer for batch prediction jobs"""
-    progress_percentage = serializers.ReadOnlyField()
+    progress_percentage = serializers.SerializerMethodField()
     
     class Meta:
         model = BatchJob
@@ -119,6 +125,11 @@ class BatchJobSerializer(serializers.ModelSerializer):
             'id', 'status', 'processed_files', 'failed_files', 'progress_percentage',
             'created_at', 'started_at', 'completed_at', 'results_file', 'error_log'
         ]
+    
+    def get_progress_percentage(self, obj):
+        # BatchJobViewSet computes this in SQL; other callers use the model property
+        progress = getattr(obj, 'progress', None)
+        return progress if progress is not None else obj.progress_percentage
 
 
 class ModelMetricsSerializer(serializers.ModelSerializer):
@@ -154,6 +165,9 @@ class PredictionRequestSerializer(serializers.Serializer):
     
     session_id = serializers.UUIDField(required=False, allow_null=True)
     
+    # Queue the prediction and return 202 with a status URL instead of waiting
+    run_async = serializers.BooleanField(required=False, default=False)
+    
     def validate(self, data):
         if not data.get('fits_file') and not data.get('kepid'):
             raise serializers.ValidationError(
@@ -162,6 +176,16 @@ class PredictionRequestSerializer(serializers.Serializer):
         return data
 
 
+class BatchPredictionRequestSerializer(serializers.Serializer):
+    """Serializer for batch prediction requests"""
+    fits_files = serializers.ListField(
+        child=serializers.FileField(),
+        allow_empty=False,
+        max_length=500
+    )
+    session_id = serializers.UUIDField(required=False, allow_null=True)
+
+
 class VisualizationRequestSerializer(serializers.Serializer):
     """Serializer for visualization requests"""
     prediction_id = serializers.UUIDField(required=False, allow_null=True)
@@ -197,6 +221,7 @@ class TransitSearchRequestSerializer(serializers.Serializer):
     period_min = serializers.FloatField(default=0.5)
     period_max = serializers.FloatField(default=50.0)
     snr_threshold = serializers.FloatField(default=7.0)
+    algorithm = serializers.ChoiceField(choices=['bls', 'tls'], default='bls')
     
     def validate(self, data):
         if not data.get('prediction_id') and not data.get('fits_file'):
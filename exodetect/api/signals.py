@@ -0,0 +1,35 @@
+"""
+Model signal handlers for ExoHunt API
+"""
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache_utils import invalidate_dashboard_cache
+from .models import Prediction, ModelMetrics, AnalysisSession
+
+
+@receiver([post_save, post_delete], sender=Prediction)
+@receiver([post_save, post_delete], sender=ModelMetrics)
+def refresh_dashboard(sender, **kwargs):
+    invalidate_dashboard_cache()
+
+
+def bump_session_counts(counts):
+    """Apply {session_id: delta} to AnalysisSession.predictions_count"""
+    for session_id, delta in counts.items():
+        if session_id is not None and delta:
+            AnalysisSession.objects.filter(pk=session_id).update(
+                predictions_count=F('predictions_count') + delta
+            )
+
+
+@receiver(post_save, sender=Prediction)
+def count_created_prediction(sender, instance, created, **kwargs):
+    if created:
+        bump_session_counts({instance.session_id: 1})
+
+
+@receiver(post_delete, sender=Prediction)
+def count_deleted_prediction(sender, instance, **kwargs):
+    bump_session_counts({instance.session_id: -1})
@@ -0,0 +1,158 @@
+"""
+Background prediction jobs run on in-process worker pools
+"""
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Concat, Now
+
+from .models import LightCurveFile, AnalysisSession, BatchJob
+
+
+# Pool name -> (setting holding its size, default size)
+POOL_SIZES = {
+    'prediction': ('PREDICTION_WORKERS', 1),
+    'download': ('DOWNLOAD_WORKERS', 4),
+}
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(name='prediction'):
+    """
+    Get a named worker pool. Downloads get their own pool so slow MAST
+    requests never hold up the prediction workers.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                setting, default = POOL_SIZES[name]
+                executor = _executors[name] = ThreadPoolExecutor(
+                    max_workers=getattr(settings, setting, default),
+                    thread_name_prefix=name
+                )
+    return executor
+
+
+def start_batch_job(job_id):
+    """Move a pending job to processing (no-op if another worker already did)"""
+    BatchJob.objects.filter(pk=job_id, status='pending').update(status='processing', started_at=Now())
+
+
+def increment_batch_progress(job_id, ok=True, error=None):
+    """
+    Count one finished file with a single UPDATE of F() increments, so
+    concurrent workers never lose counts and no row lock is taken. The job
+    is marked completed (or failed, if nothing succeeded) by the update
+    that accounts for its last file.
+    """
+    finished = Q(total_files__lte=F('processed_files') + F('failed_files') + 1)
+    outcomes = []
+    if not ok:
+        outcomes.append(When(finished & Q(processed_files=0), then=Value('failed')))
+    outcomes.append(When(finished, then=Value('completed')))
+
+    changes = {
+        'processed_files': F('processed_files') + (1 if ok else 0),
+        'failed_files': F('failed_files') + (0 if ok else 1),
+        'status': Case(*outcomes, default=F('status')),
+        'completed_at': Case(When(finished, then=Now()), default=F('completed_at')),
+    }
+    if error:
+        changes['error_log'] = Concat(F('error_log'), Value(error + '\n'))
+
+    BatchJob.objects.filter(pk=job_id).update(**changes)
+
+
+def enqueue_prediction(job_id, light_curve_id, fits_path, koi_params, session_id=None, cleanup_path=None):
+    """
+    Queue a prediction for a light curve that is already saved. The job is
+    submitted once the surrounding transaction commits, so the worker always
+    sees the LightCurveFile and BatchJob rows.
+
+    Args:
+        job_id: BatchJob tracking this prediction (total_files=1)
+        light_curve_id: LightCurveFile the prediction belongs to
+        fits_path: Path to the FITS file on disk
+        koi_params: Tabular KOI parameters
+        session_id: Optional AnalysisSession id
+        cleanup_path: Temp file the worker deletes when done
+    """
+    transaction.on_commit(lambda: _get_executor().submit(
+        run_prediction, job_id, light_curve_id, fits_path, koi_params, session_id, cleanup_path
+    ))
+
+
+def run_prediction(job_id, light_curve_id, fits_path, koi_params, session_id=None, cleanup_path=None):
+    """Worker body: run inference, save the Prediction and update the BatchJob"""
+    from .views import get_predictor, prediction_from_result, FLUX_CACHE_DIR
+
+    close_old_connections()
+    try:
+        start_batch_job(job_id)
+
+        result = get_predictor().predict(fits_path, koi_params=koi_params, cache_dir=FLUX_CACHE_DIR)
+
+        light_curve = LightCurveFile.objects.get(pk=light_curve_id)
+        session = AnalysisSession.objects.filter(pk=session_id).first() if session_id else None
+        prediction = prediction_from_result(result, light_curve, session, batch_id=job_id)
+        prediction.save(force_insert=True)
+
+        increment_batch_progress(job_id, ok=True)
+    except Exception:
+        increment_batch_progress(job_id, ok=False, error=traceback.format_exc())
+    finally:
+        if cleanup_path:
+            Path(cleanup_path).unlink(missing_ok=True)
+        # Worker threads don't go through the request cycle that normally closes this
+        connection.close()
+
+
+def enqueue_kepid_prediction(job_id, kepid, koi_params, session_id=None, user_id=None):
+    """
+    Queue a prediction for a KepID whose light curve may still need to be
+    downloaded. The download runs on the download pool and the prediction is
+    then handed to the prediction pool like an uploaded file.
+    
+    Args:
+        job_id: BatchJob tracking this prediction (total_files=1)
+        kepid: Kepler ID to fetch
+        koi_params: Tabular KOI parameters
+        session_id: Optional AnalysisSession id
+        user_id: Optional id of the requesting user (recorded on the LightCurveFile)
+    """
+    transaction.on_commit(lambda: _get_executor('download').submit(
+        run_kepid_download, job_id, kepid, koi_params, session_id, user_id
+    ))
+
+
+def run_kepid_download(job_id, kepid, koi_params, session_id=None, user_id=None):
+    """Worker body: fetch the light curve, record it, then queue the prediction"""
+    from .views import fast_download_lightcurve, light_curve_fields
+    
+    close_old_connections()
+    try:
+        start_batch_job(job_id)
+        
+        fits_path = fast_download_lightcurve(kepid)
+        light_curve = LightCurveFile.objects.create(
+            file=None,
+            uploaded_by_id=user_id,
+            **light_curve_fields(fits_path, kepid)
+        )
+        
+        _get_executor().submit(
+            run_prediction, job_id, light_curve.id, fits_path, koi_params, session_id
+        )
+    except Exception:
+        increment_batch_progress(job_id, ok=False, error=traceback.format_exc())
+    finally:
+        connection.close()
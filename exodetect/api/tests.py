@@ -1,3 +1,299 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from unittest.mock import patch
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from . import cache_utils
+from .cache_utils import PackedFluxCache, dashboard_cache_key, invalidate_dashboard_cache
+from .inference import InferenceBatcher
+from .models import (
+    uuid7, koi_features_key, pack_float_array, unpack_float_array,
+    LightCurveFile, Prediction, BatchJob
+)
+from .tasks import increment_batch_progress
+from .views import insert_light_curves, prediction_from_result
+
+
+# Bundled light curve used for upload tests
+EXAMPLE_FITS = settings.BASE_DIR / 'example_lightcurves' / '10797460.fits'
+
+
+def make_prediction(light_curve, **kwargs):
+    """Saved Prediction with fixed probabilities"""
+    fields = dict(
+        light_curve=light_curve, predicted_class=0, predicted_class_name='FALSE POSITIVE',
+        prob_false_positive=0.8, prob_candidate=0.15, prob_confirmed=0.05,
+        confidence=0.8, processing_time_ms=5
+    )
+    fields.update(kwargs)
+    return Prediction.objects.create(**fields)
+
+
+class ModelHelperTests(SimpleTestCase):
+    def test_uuid7_version_and_variant(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+    
+    def test_uuid7_is_time_ordered(self):
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        self.assertLess(first.int >> 80, second.int >> 80)
+        self.assertLess(first, second)
+    
+    def test_koi_features_key_ignores_key_order(self):
+        self.assertEqual(
+            koi_features_key({'koi_period': 9.5, 'koi_depth': 120.0}),
+            koi_features_key({'koi_depth': 120.0, 'koi_period': 9.5})
+        )
+        self.assertEqual(koi_features_key(None), koi_features_key({}))
+        self.assertNotEqual(koi_features_key({'koi_period': 9.5}), koi_features_key({'koi_period': 9.6}))
+
+
+class FloatArrayTests(SimpleTestCase):
+    def test_float_array_round_trip(self):
+        values = np.linspace(-1.0, 1.0, 257)
+        unpacked = unpack_float_array(pack_float_array(values))
+        self.assertEqual(unpacked.dtype, np.float32)
+        np.testing.assert_array_equal(unpacked, values.astype(np.float32))
+        self.assertFalse(unpacked.flags.writeable)
+    
+    def test_float_array_none(self):
+        self.assertIsNone(pack_float_array(None))
+        self.assertIsNone(unpack_float_array(None))
+
+
+class PackedFluxCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+    
+    def test_miss_then_hit(self):
+        cache = PackedFluxCache(self.cache_dir, 8)
+        self.assertIsNone(cache.get(123))
+        
+        row = np.arange(8, dtype=np.float32)
+        cache.put(123, row)
+        np.testing.assert_array_equal(cache.get(123), row)
+        
+        out = np.zeros(8, dtype=np.float32)
+        self.assertIs(cache.get(123, out=out), out)
+        np.testing.assert_array_equal(out, row)
+    
+    def test_rows_survive_reopen_and_growth(self):
+        cache = PackedFluxCache(self.cache_dir, 4)
+        cache.GROW_ROWS = 2
+        for kepid in range(5):
+            cache.put(kepid, np.full(4, kepid, dtype=np.float32))
+        
+        # A second handle (another process) sees every row
+        reopened = PackedFluxCache(self.cache_dir, 4)
+        for kepid in range(5):
+            np.testing.assert_array_equal(reopened.get(kepid), np.full(4, kepid))
+    
+    def test_rows_added_elsewhere_are_found(self):
+        reader = PackedFluxCache(self.cache_dir, 4)
+        self.assertIsNone(reader.get(7))
+        
+        PackedFluxCache(self.cache_dir, 4).put(7, np.ones(4, dtype=np.float32))
+        np.testing.assert_array_equal(reader.get(7), np.ones(4))
+    
+    def test_other_seq_len_is_ignored(self):
+        PackedFluxCache(self.cache_dir, 4).put(1, np.ones(4, dtype=np.float32))
+        self.assertIsNone(PackedFluxCache(self.cache_dir, 8).get(1))
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shared-test'},
+})
+class DashboardCacheKeyTests(SimpleTestCase):
+    def setUp(self):
+        cache_utils._dashboard_version = (0.0, None)
+        self.addCleanup(setattr, cache_utils, '_dashboard_version', (0.0, None))
+    
+    def test_own_invalidation_is_seen_immediately(self):
+        before = dashboard_cache_key('stats')
+        invalidate_dashboard_cache()
+        self.assertNotEqual(dashboard_cache_key('stats'), before)
+    
+    def test_other_workers_token_is_read_after_ttl(self):
+        before = dashboard_cache_key('stats')
+        # Another worker invalidates through the shared cache
+        caches['shared'].set(cache_utils.DASHBOARD_VERSION_KEY, 'elsewhere', timeout=None)
+        self.assertEqual(dashboard_cache_key('stats'), before)
+        
+        cache_utils._dashboard_version = (0.0, cache_utils._dashboard_version[1])
+        self.assertEqual(dashboard_cache_key('stats'), 'dashboard:stats:elsewhere')
+
+
+class InferenceBatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.batch_sizes = []
+        self.batcher = InferenceBatcher(self.forward, window_ms=1000)
+    
+    def forward(self, flux_batch, tab_batch):
+        self.batch_sizes.append(len(flux_batch))
+        return flux_batch[:, :1] + tab_batch[:, :1]
+    
+    def test_lone_request_does_not_wait(self):
+        start = time.monotonic()
+        self.batcher.begin()
+        probs = self.batcher.submit(np.full(3, 1.0), np.full(2, 2.0))
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(probs.tolist(), [3.0])
+        self.assertEqual(self.batch_sizes, [1])
+    
+    def test_concurrent_requests_share_a_forward_pass(self):
+        n = 4
+        ready = threading.Barrier(n)
+        results = [None] * n
+        
+        def call(i):
+            self.batcher.begin()
+            ready.wait()
+            results[i] = self.batcher.submit(np.full(3, float(i)), np.full(2, 10.0))
+        
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual([r.tolist() for r in results], [[10.0 + i] for i in range(n)])
+        self.assertEqual(sum(self.batch_sizes), n)
+        self.assertGreater(max(self.batch_sizes), 1)
+    
+    def test_forward_errors_reach_the_caller(self):
+        batcher = InferenceBatcher(lambda flux, tab: 1 / 0, window_ms=10)
+        batcher.begin()
+        with self.assertRaises(ZeroDivisionError):
+            batcher.submit(np.ones(3), np.ones(2))
+
+
+class BatchProgressTests(TestCase):
+    def make_job(self, total_files=2):
+        return BatchJob.objects.create(status='processing', total_files=total_files)
+    
+    def test_completes_on_last_file(self):
+        job = self.make_job()
+        increment_batch_progress(job.id, ok=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed_files), ('processing', 1))
+        self.assertIsNone(job.completed_at)
+        
+        increment_batch_progress(job.id, ok=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed_files, job.failed_files), ('completed', 2, 0))
+        self.assertIsNotNone(job.completed_at)
+    
+    def test_partial_failure_still_completes(self):
+        job = self.make_job()
+        increment_batch_progress(job.id, ok=False, error='first failed')
+        increment_batch_progress(job.id, ok=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed_files, job.failed_files), ('completed', 1, 1))
+        self.assertEqual(job.error_log, 'first failed\n')
+    
+    def test_all_failed_marks_job_failed(self):
+        job = self.make_job()
+        increment_batch_progress(job.id, ok=False, error='a')
+        increment_batch_progress(job.id, ok=False, error='b')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.failed_files), ('failed', 2))
+        self.assertEqual(job.error_log, 'a\nb\n')
+
+
+class RecentPredictionsCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        light_curve = LightCurveFile.objects.create(file=None, kepid=1)
+        for _ in range(7):
+            make_prediction(light_curve)
+    
+    def test_cursor_pages_cover_every_row_once(self):
+        client = APIClient()
+        url = reverse('recent-predictions')
+        expected = [str(pk) for pk in Prediction.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+        
+        seen = []
+        params = {'limit': 3}
+        while True:
+            data = client.get(url, params).json()
+            self.assertEqual(data['count'], 7)
+            seen += [row['id'] for row in data['results']]
+            if data['next_cursor'] is None:
+                break
+            params['cursor'] = data['next_cursor']
+        
+        self.assertEqual(seen, expected)
+    
+    def test_invalid_cursor(self):
+        response = APIClient().get(reverse('recent-predictions'), {'cursor': 'not-a-uuid'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_limit_must_be_positive(self):
+        client = APIClient()
+        url = reverse('recent-predictions')
+        for params in ({'limit': 0}, {'limit': -5}, {'limit': 'ten'}, {'offset': -1}):
+            self.assertEqual(client.get(url, params).status_code, 400, params)
+    
+    def test_limit_is_clamped(self):
+        with patch('api.views.RECENT_PREDICTIONS_MAX_LIMIT', 2):
+            data = APIClient().get(reverse('recent-predictions'), {'limit': 100}).json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNotNone(data['next_cursor'])
+
+
+class UploadDedupeTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+    
+    def upload(self, client):
+        with open(EXAMPLE_FITS, 'rb') as f:
+            return client.post(reverse('predict-single'), {'fits_file': f}, format='multipart')
+    
+    def test_repeat_upload_reuses_file_and_prediction(self):
+        client = APIClient()
+        first = self.upload(client)
+        self.assertEqual(first.status_code, 201)
+        
+        second = self.upload(client)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['prediction_id'], first.json()['prediction_id'])
+        self.assertEqual(second.json()['prediction'], first.json()['prediction'])
+        self.assertEqual(LightCurveFile.objects.count(), 1)
+        self.assertEqual(Prediction.objects.count(), 1)
+
+
+class BatchInsertTests(TestCase):
+    def test_batch_insert_keeps_the_row_that_won(self):
+        existing = LightCurveFile.objects.create(file=None, kepid=1, content_sha256='a' * 64)
+        duplicate = LightCurveFile(kepid=1, content_sha256='a' * 64)
+        fresh = LightCurveFile(kepid=2, content_sha256='b' * 64)
+        result = {
+            'predicted_class': 0, 'predicted_class_name': 'FALSE POSITIVE',
+            'probabilities': {'FALSE_POSITIVE': 0.8, 'CANDIDATE': 0.15, 'CONFIRMED': 0.05},
+            'confidence': 0.8, 'processing_time_ms': 5, 'model_version': 'v1.0',
+        }
+        predictions = [prediction_from_result(result, lc, None) for lc in (duplicate, fresh)]
+        
+        insert_light_curves([duplicate, fresh], predictions, LightCurveFile._meta.get_field('file').storage)
+        
+        self.assertEqual(LightCurveFile.objects.count(), 2)
+        self.assertEqual(predictions[0].light_curve, existing)
+        self.assertTrue(LightCurveFile.objects.filter(pk=fresh.pk).exists())
@@ -0,0 +1,27 @@
+"""
+Upload handlers that do per-file work while Django streams the request body
+"""
+import hashlib
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Spools uploads to a temp file like TemporaryFileUploadHandler and hashes
+    each chunk on the way through, so the finished file carries its SHA-256
+    as ``content_sha256`` without being read back from disk.
+    """
+    
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._sha256 = hashlib.sha256()
+    
+    def receive_data_chunk(self, raw_data, start):
+        self._sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+    
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.content_sha256 = self._sha256.hexdigest()
+        return uploaded_file
@@ -8,10 +8,13 @@ from . import views
 # Router for ViewSets
 router = DefaultRouter()
 router.register(r'sessions', views.AnalysisSessionViewSet, basename='session')
+router.register(r'batch-jobs', views.BatchJobViewSet, basename='batch-job')
 
 urlpatterns = [
     # Prediction endpoints
     path('predict/single/', views.predict_single, name='predict-single'),
+    path('predict/batch/', views.predict_batch, name='predict-batch'),
+    path('predict/<uuid:job_id>/status/', views.prediction_status, name='predict-status'),
     
     # Helper endpoints
     path('search-kepid/', views.search_by_kepid, name='search-kepid'),
@@ -29,6 +32,6 @@ urlpatterns = [
     # Feedback
     path('feedback/submit/', views.submit_feedback, name='submit-feedback'),
     
-    # Include router URLs (sessions)
+    # Include router URLs (sessions, batch jobs)
     path('', include(router.urls)),
 ]
@@ -7,22 +7,102 @@ from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.conf import settings
+from django.core.cache import cache, caches
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
-from django.db.models import Count, Avg, Q
+from django.core.files.move import file_move_safe
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Avg, Q, F, FloatField, Subquery
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.urls import reverse
 from django.utils import timezone
 
 import os
 import uuid
+import shutil
 import tempfile
+import threading
+import time
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 import pandas as pd
-import lightkurve as lk
 from astropy.io import fits as astropy_fits
 import requests
 
-from .cache_utils import get_cached_fits, save_to_cache
+from .cache_utils import (
+    get_cached_fits, save_to_cache, get_cached_light_curve, dashboard_cache_key, file_sha256,
+    plot_cache_key
+)
+from .models import (
+    koi_features_key, LightCurveFile, KOIParameters, Prediction, ExplainabilityData,
+    UserFeedback, TransitDetection, AnalysisSession, BatchJob, ModelMetrics
+)
+from .serializers import (
+    LightCurveFileSerializer, KOIParametersSerializer, PredictionSerializer,
+    ExplainabilityDataSerializer, UserFeedbackSerializer, TransitDetectionSerializer,
+    AnalysisSessionSerializer, BatchJobSerializer, ModelMetricsSerializer,
+    PredictionRequestSerializer, BatchPredictionRequestSerializer,
+    VisualizationRequestSerializer,
+    PhaseFoldRequestSerializer, TransitSearchRequestSerializer
+)
+from .constants import CLASS_NAMES
+from .inference import ExoplanetPredictor, extract_light_curve_metadata
+from .flux_utils import read_fits_light_curve, lightcurve_stats
+from .db_utils import persist_predictions
+from .tasks import enqueue_prediction, enqueue_kepid_prediction
+from .visualization import (
+    create_interactive_plot, detect_transits, phase_fold_light_curve,
+    calculate_periodogram, detect_anomalies, compare_light_curves
+)
+
+
+# Local FITS directories, highest priority first: curated examples (deployment), then development files
+LOCAL_FITS_DIRS = (
+    ('example', os.path.join(settings.BASE_DIR, 'example_lightcurves')),
+    ('local', os.path.join(settings.BASE_DIR, '..', 'lightcurves')),
+)
+LOCAL_FITS_RESCAN_INTERVAL = 60  # seconds between directory sweeps on a miss
+
+# kepid -> (source, path) for files in LOCAL_FITS_DIRS
+_local_fits = {}
+_local_fits_scanned = None
+
+
+def _scan_local_fits():
+    """Rebuild _local_fits from one scandir sweep per directory"""
+    global _local_fits, _local_fits_scanned
+    entries = {}
+    for source, directory in reversed(LOCAL_FITS_DIRS):
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.endswith('.fits') and name[:-5].isdigit():
+                        entries[int(name[:-5])] = (source, entry.path)
+        except OSError:
+            continue
+    _local_fits = entries
+    _local_fits_scanned = time.monotonic()
+
+
+def local_fits(kepid):
+    """
+    (source, path) of a bundled FITS file for kepid, or None. Directories are
+    swept at most once per LOCAL_FITS_RESCAN_INTERVAL instead of stat'ing
+    candidate paths on every request.
+    """
+    kepid = int(kepid)
+    entry = _local_fits.get(kepid)
+    if entry is None and (
+        _local_fits_scanned is None
+        or time.monotonic() - _local_fits_scanned > LOCAL_FITS_RESCAN_INTERVAL
+    ):
+        _scan_local_fits()
+        entry = _local_fits.get(kepid)
+    return entry
 
 
 def fast_download_lightcurve(kepid: int) -> str:
@@ -36,29 +116,25 @@ def fast_download_lightcurve(kepid: int) -> str:
     Returns:
         Path to FITS file
     """
-    # Check example_lightcurves directory first (for curated examples, deployment-ready)
-    example_lightcurves_dir = os.path.join(settings.BASE_DIR, 'example_lightcurves')
-    local_fits = os.path.join(example_lightcurves_dir, f'{kepid}.fits')
-    if os.path.exists(local_fits):
-        print(f"✅ Using example FITS file for KepID {kepid}")
-        return local_fits
-    
-    # Check parent lightcurves directory (for development)
-    lightcurves_dir = os.path.join(settings.BASE_DIR, '..', 'lightcurves')
-    local_fits = os.path.join(lightcurves_dir, f'{kepid}.fits')
-    if os.path.exists(local_fits):
-        print(f"✅ Using local FITS file for KepID {kepid}")
-        return local_fits
+    # Check example_lightcurves first (curated examples), then the parent lightcurves directory
+    local = local_fits(kepid)
+    if local is not None:
+        source, path = local
+        print(f"✅ Using {source} FITS file for KepID {kepid}")
+        return path
     
     # Check cache second
     cached_path = get_cached_fits(kepid)
-    if cached_path and os.path.exists(cached_path):
+    if cached_path:
         print(f"✅ Using cached FITS for KepID {kepid}")
         return cached_path
     
     print(f"⬇️ Downloading FITS for KepID {kepid}...")
     
-    # Use lightkurve but with quick download
+    # Use lightkurve but with quick download. Imported here, since it takes
+    # seconds to load and only cache misses need it
+    import lightkurve as lk
+    
     try:
         # Quick search with minimal timeout
         search_result = lk.search_lightcurve(f'KIC {kepid}', mission='Kepler')
@@ -83,45 +159,191 @@ def fast_download_lightcurve(kepid: int) -> str:
         raise Exception(f"Failed to download light curve for KepID {kepid}: {str(e)}")
 
 
+def uploaded_fits_path(fits_file):
+    """
+    Get an on-disk path for an uploaded FITS file.
+    Uploads Django already spooled to a temp file are used in place;
+    in-memory uploads are written out once.
+    
+    Returns:
+        Tuple of (path, owned) - owned is True when the caller must delete the file
+    """
+    temporary_file_path = getattr(fits_file, 'temporary_file_path', None)
+    if temporary_file_path is not None:
+        return temporary_file_path(), False
+    
+    temp_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.fits")
+    fits_file.seek(0)
+    with open(temp_path, 'wb') as destination:
+        shutil.copyfileobj(fits_file.file, destination, 1 << 20)
+    return temp_path, True
 
 
+def upload_sha256(fits_file, path):
+    """SHA-256 of an upload, taken from the upload handler when it hashed the stream"""
+    return getattr(fits_file, 'content_sha256', None) or file_sha256(path)
 
-from .models import (
-    LightCurveFile, KOIParameters, Prediction, ExplainabilityData,
-    UserFeedback, TransitDetection, AnalysisSession, BatchJob, ModelMetrics
-)
-from .serializers import (
-    LightCurveFileSerializer, KOIParametersSerializer, PredictionSerializer,
-    ExplainabilityDataSerializer, UserFeedbackSerializer, TransitDetectionSerializer,
-    AnalysisSessionSerializer, BatchJobSerializer, ModelMetricsSerializer,
-    PredictionRequestSerializer, VisualizationRequestSerializer,
-    PhaseFoldRequestSerializer, TransitSearchRequestSerializer
-)
-from .inference import ExoplanetPredictor, extract_light_curve_metadata
-from .visualization import (
-    create_interactive_plot, detect_transits, phase_fold_light_curve,
-    calculate_periodogram, detect_anomalies, compare_light_curves
+
+def load_light_curve(fits_path, uploaded=False):
+    """
+    Parsed time/flux arrays for a FITS file. Files that stay on disk
+    (cached downloads, stored LightCurveFiles) use the array cache;
+    one-off uploads are read directly so they don't fill it.
+    """
+    if uploaded:
+        return read_fits_light_curve(fits_path)
+    return get_cached_light_curve(fits_path)
+
+
+def store_fits_file(src_path, filename):
+    """
+    Move a FITS file that is already on disk into LightCurveFile storage,
+    instead of having FieldFile.save() stream it again.
+    
+    Returns:
+        Storage name for the FileField, or None if the storage backend
+        has no local filesystem (caller should save the upload normally)
+    """
+    field = LightCurveFile._meta.get_field('file')
+    storage = field.storage
+    
+    while True:
+        name = storage.get_available_name(
+            field.generate_filename(None, os.path.basename(filename)),
+            max_length=field.max_length
+        )
+        try:
+            final_path = storage.path(name)
+        except NotImplementedError:
+            return None
+        
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        try:
+            # Rename on the same filesystem, copy otherwise
+            file_move_safe(src_path, final_path)
+            break
+        except FileExistsError:
+            # Another request claimed this name first; pick the next one
+            continue
+    
+    if storage.file_permissions_mode is not None:
+        os.chmod(final_path, storage.file_permissions_mode)
+    
+    return name
+
+
+# Model artifacts (resolved once at import)
+TRAINING_DIR = os.path.join(settings.BASE_DIR, '..', 'training')
+MODEL_PATH = os.path.join(TRAINING_DIR, 'exoplanet_hybrid.pth')
+SCALER_PATH = os.path.join(TRAINING_DIR, 'koi_scaler.joblib')
+FEATURES_PATH = os.path.join(TRAINING_DIR, 'tab_features_list.joblib')
+FLUX_CACHE_DIR = os.path.join(TRAINING_DIR, 'lc_cache_npy')
+
+# Explainability endpoint is not routed yet, so it can't be reversed
+EXPLAIN_URL = '/api/explain/feature-importance/'
+
+
+@lru_cache(maxsize=None)
+def endpoint_url(name):
+    """
+    Reverse a named URL once and reuse it. Done lazily because urls.py
+    imports this module, so the URLconf isn't loaded yet at import time.
+    """
+    return reverse(name)
+
+
+# KOI parameters accepted as tabular model inputs
+KOI_FEATURE_FIELDS = frozenset((
+    'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_ror',
+    'koi_model_snr', 'koi_num_transits', 'koi_steff', 'koi_slogg',
+    'koi_srad', 'koi_smass', 'koi_kepmag', 'koi_insol', 'koi_dor',
+    'koi_count',
+    # 'koi_score' REMOVED - data leakage (0.89 correlation with label)
+))
+
+# KOI catalogue served by search_by_kepid and get_example_data
+KOI_CSV_PATH = os.path.join(settings.BASE_DIR, '..', 'dataset', 'koi.csv')
+
+# Catalogue columns returned as parameters, in response order
+KOI_PARAM_COLUMNS = (
+    'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_ror',
+    'koi_model_snr', 'koi_num_transits', 'koi_steff', 'koi_slogg',
+    'koi_srad', 'koi_smass', 'koi_kepmag', 'koi_insol', 'koi_dor',
+    'koi_count',
 )
+KOI_INT_COLUMNS = frozenset(('koi_num_transits', 'koi_count'))
+KOI_CSV_COLUMNS = frozenset(('kepid', 'koi_disposition', 'kepler_name') + KOI_PARAM_COLUMNS)
 
+# (mtime_ns, {kepid: first catalogue row})
+_KOI_INDEX = None
+_KOI_INDEX_LOCK = threading.Lock()
+
+
+def koi_index():
+    """
+    koi.csv rows keyed by kepid, parsed once per process and re-read only
+    when the file's mtime changes. Keeps the first row per kepid, matching
+    the old per-request filter + iloc[0].
+    """
+    global _KOI_INDEX
+    mtime_ns = os.stat(KOI_CSV_PATH).st_mtime_ns
+    index = _KOI_INDEX
+    if index is None or index[0] != mtime_ns:
+        with _KOI_INDEX_LOCK:
+            if _KOI_INDEX is None or _KOI_INDEX[0] != mtime_ns:
+                df = pd.read_csv(KOI_CSV_PATH, usecols=lambda c: c in KOI_CSV_COLUMNS)
+                df = df.drop_duplicates('kepid', keep='first').set_index('kepid', drop=False)
+                _KOI_INDEX = (mtime_ns, df.to_dict(orient='index'))
+            index = _KOI_INDEX
+    return index[1]
+
+
+def koi_str(value):
+    """Catalogue string value, or None for NaN/empty"""
+    if pd.isna(value):
+        return None
+    return str(value) if value != '' else None
+
+
+def koi_row_params(kepid, row):
+    """Response parameters for one koi_index() row"""
+    params = {'kepid': kepid}
+    for name in KOI_PARAM_COLUMNS:
+        value = row.get(name)
+        if pd.notna(value):
+            params[name] = int(value) if name in KOI_INT_COLUMNS else float(value)
+        else:
+            params[name] = None
+    params['koi_disposition'] = koi_str(row.get('koi_disposition'))
+    params['kepler_name'] = koi_str(row.get('kepler_name'))
+    return params
+
+
+# Runs the periodogram alongside BLS in analyze_transits (threads start on first use)
+ANALYSIS_POOL = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ANALYSIS_WORKERS', 4),
+    thread_name_prefix='analysis'
+)
 
 # Initialize global predictor (loaded once)
 PREDICTOR = None
+_PREDICTOR_LOCK = threading.Lock()
 
 def get_predictor():
-    """Lazy load the predictor"""
+    """Lazy load the predictor (thread-safe, loaded once per process)"""
     global PREDICTOR
     if PREDICTOR is None:
-        model_path = os.path.join(settings.BASE_DIR, '..', 'training', 'exoplanet_hybrid.pth')
-        scaler_path = os.path.join(settings.BASE_DIR, '..', 'training', 'koi_scaler.joblib')
-        features_path = os.path.join(settings.BASE_DIR, '..', 'training', 'tab_features_list.joblib')
-        cache_dir = os.path.join(settings.BASE_DIR, '..', 'training', 'lc_cache_npy')
-        
-        PREDICTOR = ExoplanetPredictor(
-            model_path=model_path,
-            scaler_path=scaler_path,
-            features_path=features_path,
-            seq_len=2000
-        )
+        with _PREDICTOR_LOCK:
+            if PREDICTOR is None:
+                PREDICTOR = ExoplanetPredictor(
+                    model_path=MODEL_PATH,
+                    scaler_path=SCALER_PATH,
+                    features_path=FEATURES_PATH,
+                    seq_len=2000,
+                    batch_window_ms=getattr(settings, 'PREDICTOR_BATCH_WINDOW_MS', 0),
+                    cpu_bf16=getattr(settings, 'PREDICTOR_CPU_BF16', False),
+                    cuda_amp=getattr(settings, 'PREDICTOR_CUDA_AMP', False)
+                )
     return PREDICTOR
 
 
@@ -129,6 +351,76 @@ def get_predictor():
 # PREDICTION ENDPOINTS
 # ============================================================================
 
+def for_prediction_listing(predictions):
+    """Select only the Prediction and LightCurveFile columns PredictionSerializer reads"""
+    return predictions.select_related('light_curve').only(
+        *Prediction.LIST_FIELDS,
+        'light_curve__kepid', 'light_curve__flux_points',
+        'light_curve__duration_days', 'light_curve__data_quality_score'
+    )
+
+
+def prediction_with_light_curve(prediction_id):
+    """
+    Fetch a Prediction and its LightCurveFile in one query, loading only
+    the columns the visualization and analysis views read
+    """
+    return Prediction.objects.select_related('light_curve').only(
+        'predicted_class_name', 'light_curve__kepid', 'light_curve__file'
+    ).get(id=prediction_id)
+
+
+def light_curve_fields(fits_path, kepid=None):
+    """LightCurveFile field values read from a FITS file, with defaults for anything missing"""
+    metadata = extract_light_curve_metadata(fits_path)
+    return {
+        'kepid': kepid or metadata.get('kepid'),
+        'flux_points': metadata.get('flux_points') or 0,
+        'duration_days': metadata.get('duration_days'),
+        'data_quality_score': metadata.get('data_quality_score') or 0.0,
+        'gaps_detected': metadata.get('gaps_detected') or 0,
+        'flux_type': metadata.get('flux_type') or 'PDCSAP_FLUX',
+    }
+
+
+def prediction_from_result(result, light_curve, session=None, batch_id=None):
+    """Build an unsaved Prediction from a predictor result dict"""
+    return Prediction(
+        light_curve=light_curve,
+        session=session,
+        predicted_class=result['predicted_class'],
+        predicted_class_name=result['predicted_class_name'],
+        prob_false_positive=result['probabilities']['FALSE_POSITIVE'],
+        prob_candidate=result['probabilities']['CANDIDATE'],
+        prob_confirmed=result['probabilities']['CONFIRMED'],
+        confidence=result['confidence'],
+        model_version=result['model_version'],
+        processing_time_ms=result['processing_time_ms'],
+        features_key=koi_features_key(result.get('features_used')),
+        batch_id=batch_id
+    )
+
+
+def koi_params_from(data):
+    """The KOI feature values present in validated request data"""
+    return {
+        k: v for k, v in data.items()
+        if k in KOI_FEATURE_FIELDS and v is not None
+    }
+
+
+def async_prediction_response(job, kepid):
+    """202 response pointing at the status endpoint of a queued prediction"""
+    return Response({
+        'job_id': str(job.id),
+        'status': job.status,
+        'kepid': kepid,
+        'links': {
+            'status': reverse('predict-status', args=[job.id])
+        }
+    }, status=status.HTTP_202_ACCEPTED)
+
+
 @api_view(['POST'])
 def predict_single(request):
     """
@@ -154,6 +446,19 @@ def predict_single(request):
         kepid_param = data['kepid']
         use_lightkurve = True
         
+        if data.get('run_async'):
+            # A MAST download can take minutes; do it in the background too
+            job = BatchJob.objects.create(
+                user=request.user if request.user.is_authenticated else None,
+                total_files=1
+            )
+            enqueue_kepid_prediction(
+                job.id, kepid_param, koi_params_from(data),
+                session_id=data.get('session_id'),
+                user_id=request.user.id if request.user.is_authenticated else None
+            )
+            return async_prediction_response(job, kepid_param)
+        
         try:
             fits_path_to_use = fast_download_lightcurve(kepid_param)
             
@@ -170,92 +475,106 @@ def predict_single(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Save uploaded file temporarily (if uploaded)
+    # Get uploaded file on disk (if uploaded)
     if not use_lightkurve:
-        temp_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.fits")
-        with open(temp_path, 'wb+') as destination:
-            for chunk in fits_file.chunks():
-                destination.write(chunk)
-        fits_path_to_use = temp_path
+        fits_path_to_use, owned = uploaded_fits_path(fits_file)
+        if owned:
+            temp_path = fits_path_to_use
     
     try:
         # Extract metadata
-        metadata = extract_light_curve_metadata(fits_path_to_use)
-        
-        # Ensure all required fields have default values
-        kepid = kepid_param or metadata.get('kepid')
-        flux_points = metadata.get('flux_points') or 0
-        duration_days = metadata.get('duration_days')
-        data_quality_score = metadata.get('data_quality_score') or 0.0
-        gaps_detected = metadata.get('gaps_detected') or 0
-        flux_type = metadata.get('flux_type') or 'PDCSAP_FLUX'
+        fields = light_curve_fields(fits_path_to_use, kepid_param)
         
         # Save to database
         if use_lightkurve:
             # For lightkurve downloads, create a reference but don't duplicate
             lc_file = LightCurveFile.objects.create(
                 file=None,  # Don't duplicate file
-                kepid=kepid,
-                flux_points=flux_points,
-                duration_days=duration_days,
-                data_quality_score=data_quality_score,
-                gaps_detected=gaps_detected,
-                flux_type=flux_type,
-                uploaded_by=request.user if request.user.is_authenticated else None
+                uploaded_by=request.user if request.user.is_authenticated else None,
+                **fields
             )
         else:
-            lc_file = LightCurveFile.objects.create(
-                file=fits_file,
-                kepid=kepid,
-                flux_points=flux_points,
-                duration_days=duration_days,
-                data_quality_score=data_quality_score,
-                gaps_detected=gaps_detected,
-                flux_type=flux_type,
-                uploaded_by=request.user if request.user.is_authenticated else None
-            )
+            # Identical re-uploads reuse the stored file and its row
+            content_sha256 = upload_sha256(fits_file, fits_path_to_use)
+            lc_file = LightCurveFile.objects.filter(content_sha256=content_sha256).first()
+            
+            if lc_file is None:
+                # Move the on-disk upload into storage rather than writing it again
+                stored_name = store_fits_file(fits_path_to_use, fits_file.name)
+                if stored_name is not None and fits_path_to_use == temp_path:
+                    temp_path = None
+                
+                try:
+                    with transaction.atomic():
+                        lc_file = LightCurveFile.objects.create(
+                            file=stored_name or fits_file,
+                            content_sha256=content_sha256,
+                            uploaded_by=request.user if request.user.is_authenticated else None,
+                            **fields
+                        )
+                except IntegrityError:
+                    # The same file was uploaded concurrently; keep the row that won
+                    if stored_name is not None:
+                        LightCurveFile._meta.get_field('file').storage.delete(stored_name)
+                    lc_file = LightCurveFile.objects.get(content_sha256=content_sha256)
+            
+            if lc_file.file:
+                try:
+                    fits_path_to_use = lc_file.file.path
+                except NotImplementedError:
+                    pass
         
         # Prepare KOI parameters
-        koi_params = {}
-        koi_feature_fields = [
-            'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_ror',
-            'koi_model_snr', 'koi_num_transits', 'koi_steff', 'koi_slogg',
-            'koi_srad', 'koi_smass', 'koi_kepmag', 'koi_insol', 'koi_dor',
-            'koi_count'
-            # 'koi_score' REMOVED - data leakage (0.89 correlation with label)
-        ]
-        for field in koi_feature_fields:
-            if field in data and data[field] is not None:
-                koi_params[field] = data[field]
-        
-        # Get predictor and make prediction
-        predictor = get_predictor()
-        cache_dir = os.path.join(settings.BASE_DIR, '..', 'training', 'lc_cache_npy')
-        
-        result = predictor.predict(
-            fits_path_to_use,
-            koi_params=koi_params,
-            cache_dir=cache_dir
-        )
+        koi_params = koi_params_from(data)
         
         # Get or create session
         session = None
         if data.get('session_id'):
             session = AnalysisSession.objects.filter(id=data['session_id']).first()
         
-        # Save prediction
-        prediction = Prediction.objects.create(
-            light_curve=lc_file,
-            session=session,
-            predicted_class=result['predicted_class'],
-            predicted_class_name=result['predicted_class_name'],
-            prob_false_positive=result['probabilities']['FALSE_POSITIVE'],
-            prob_candidate=result['probabilities']['CANDIDATE'],
-            prob_confirmed=result['probabilities']['CONFIRMED'],
-            confidence=result['confidence'],
-            model_version=result['model_version'],
-            processing_time_ms=result['processing_time_ms']
-        )
+        # Same file, same KOI parameters, same model: the earlier answer still holds
+        previous = None
+        if not use_lightkurve:
+            previous = Prediction.objects.filter(
+                light_curve=lc_file,
+                features_key=koi_features_key(koi_params),
+                model_version=get_predictor().model_version
+            ).order_by('-created_at').first()
+        
+        if previous is None and data.get('run_async'):
+            # Hand off to the background worker; it owns the temp file from here
+            job = BatchJob.objects.create(
+                user=request.user if request.user.is_authenticated else None,
+                total_files=1
+            )
+            enqueue_prediction(
+                job.id, lc_file.id, fits_path_to_use, koi_params,
+                session_id=data.get('session_id'), cleanup_path=temp_path
+            )
+            temp_path = None
+            
+            return async_prediction_response(job, lc_file.kepid)
+        
+        if previous is not None:
+            result = previous.as_result()
+            result['features_used'] = koi_params
+        else:
+            # Get predictor and make prediction
+            predictor = get_predictor()
+            
+            result = predictor.predict(
+                fits_path_to_use,
+                koi_params=koi_params,
+                cache_dir=FLUX_CACHE_DIR
+            )
+        
+        # Save prediction (a reused result still gets its own row when filed under another session)
+        created = not (previous is not None and previous.session_id == (session.id if session else None))
+        if created:
+            prediction = prediction_from_result(result, lc_file, session)
+            prediction.save(force_insert=True)
+        else:
+            prediction = previous
         
         # Build response
         response_data = {
@@ -279,13 +598,13 @@ def predict_single(request):
             },
             'features_used': koi_params,
             'links': {
-                'visualize': f'/api/lightcurve/visualize/?prediction_id={prediction.id}',
-                'explain': f'/api/explain/feature-importance/?prediction_id={prediction.id}',
-                'feedback': f'/api/feedback/submit/?prediction_id={prediction.id}'
+                'visualize': f"{endpoint_url('visualize-lightcurve')}?prediction_id={prediction.id}",
+                'explain': f'{EXPLAIN_URL}?prediction_id={prediction.id}',
+                'feedback': f"{endpoint_url('submit-feedback')}?prediction_id={prediction.id}"
             }
         }
         
-        return Response(response_data, status=status.HTTP_201_CREATED)
+        return Response(response_data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
     
     except Exception as e:
         import traceback
@@ -295,8 +614,200 @@ def predict_single(request):
         )
     finally:
         # Clean up temporary file only if we created one
-        if temp_path and os.path.exists(temp_path):
-            os.remove(temp_path)
+        if temp_path:
+            Path(temp_path).unlink(missing_ok=True)
+
+
+@api_view(['GET'])
+def prediction_status(request, job_id):
+    """
+    GET /api/predict/<job_id>/status/
+    
+    Poll a prediction queued with run_async. Includes the prediction once
+    the job has completed.
+    """
+    job = BatchJob.objects.filter(id=job_id).first()
+    if job is None:
+        return Response(
+            {'error': 'Job not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    response_data = {
+        'job_id': str(job.id),
+        'status': job.status,
+        'created_at': job.created_at.isoformat(),
+        'completed_at': job.completed_at.isoformat() if job.completed_at else None,
+    }
+    
+    if job.status == 'completed':
+        prediction = Prediction.objects.select_related('light_curve').filter(batch_id=job.id).first()
+        if prediction is not None:
+            response_data['prediction_id'] = str(prediction.id)
+            response_data['prediction'] = PredictionSerializer(prediction).data
+    elif job.status == 'failed':
+        response_data['error'] = job.error_log
+    
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def predict_batch(request):
+    """
+    POST /api/predict/batch/
+    
+    Upload several FITS files (repeated `fits_files` field) and classify them
+    in one pass. Light curves and predictions are written in bulk and tracked
+    by a BatchJob.
+    """
+    serializer = BatchPredictionRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
+    fits_files = data['fits_files']
+    user = request.user if request.user.is_authenticated else None
+    
+    session = None
+    if data.get('session_id'):
+        session = AnalysisSession.objects.filter(id=data['session_id']).first()
+    
+    job = BatchJob.objects.create(
+        user=user,
+        status='processing',
+        total_files=len(fits_files),
+        started_at=timezone.now()
+    )
+    
+    temp_paths = []
+    try:
+        fits_paths = []
+        for fits_file in fits_files:
+            path, owned = uploaded_fits_path(fits_file)
+            fits_paths.append(path)
+            if owned:
+                temp_paths.append(path)
+        
+        # Classify everything first, then write the rows in bulk
+        predictor = get_predictor()
+        results = predictor.predict_batch(fits_paths, cache_dir=FLUX_CACHE_DIR)
+        
+        # New files by hash: (row, path on disk, upload); stored once the batch is written
+        new_files = {}
+        predictions = []
+        items = []
+        errors = []
+        
+        # Files already stored (or repeated within this batch) reuse their row
+        hashes = [upload_sha256(fits_file, path) for fits_file, path in zip(fits_files, fits_paths)]
+        known_files = LightCurveFile.objects.in_bulk(set(hashes), field_name='content_sha256')
+        
+        for fits_file, path, content_sha256, result in zip(fits_files, fits_paths, hashes, results):
+            if not result.get('success'):
+                errors.append(f"{fits_file.name}: {result.get('error')}")
+                items.append({'file': fits_file.name, 'success': False, 'error': result.get('error')})
+                continue
+            
+            lc_file = known_files.get(content_sha256)
+            if lc_file is None:
+                lc_file = LightCurveFile(
+                    content_sha256=content_sha256,
+                    uploaded_by=user,
+                    **light_curve_fields(path)
+                )
+                known_files[content_sha256] = lc_file
+                new_files[content_sha256] = (lc_file, path, fits_file)
+            
+            prediction = prediction_from_result(result, lc_file, session, batch_id=job.id)
+            predictions.append(prediction)
+            items.append({
+                'file': fits_file.name,
+                'success': True,
+                'prediction_id': str(prediction.id),
+                'kepid': lc_file.kepid,
+                'prediction': {
+                    'class': result['predicted_class_name'],
+                    'probabilities': result['probabilities'],
+                    'confidence': result['confidence']
+                }
+            })
+        
+        # Light curves and predictions land together or not at all; files moved
+        # into storage for a batch that rolls back are deleted again
+        storage = LightCurveFile._meta.get_field('file').storage
+        stored_names = []
+        try:
+            with transaction.atomic():
+                for lc_file, path, fits_file in new_files.values():
+                    stored_name = store_fits_file(path, fits_file.name)
+                    if stored_name is not None:
+                        lc_file.file.name = stored_name
+                        if path in temp_paths:
+                            temp_paths.remove(path)
+                    else:
+                        lc_file.file.save(fits_file.name, fits_file, save=False)
+                    stored_names.append(lc_file.file.name)
+                
+                insert_light_curves([row for row, _, _ in new_files.values()], predictions, storage)
+                persist_predictions(predictions)
+        except Exception:
+            for name in stored_names:
+                storage.delete(name)
+            raise
+        
+        job.status = 'completed'
+        job.processed_files = len(predictions)
+        job.failed_files = len(errors)
+        job.error_log = '\n'.join(errors)
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'processed_files', 'failed_files', 'error_log', 'completed_at'])
+        
+        return Response({
+            'job': BatchJobSerializer(job).data,
+            'results': items
+        }, status=status.HTTP_201_CREATED)
+    
+    except Exception as e:
+        import traceback
+        job.status = 'failed'
+        job.error_log = traceback.format_exc()
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'error_log', 'completed_at'])
+        return Response(
+            {'error': f'Batch prediction error: {str(e)}', 'job_id': str(job.id)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    finally:
+        for path in temp_paths:
+            Path(path).unlink(missing_ok=True)
+
+
+def insert_light_curves(light_curves, predictions, storage):
+    """
+    Bulk insert new LightCurveFile rows. If another request stored one of the
+    same files in the meantime (unique content_sha256), the rows are inserted
+    one by one instead and each clash is resolved like predict_single does:
+    the existing row is kept, this batch's copy of the file is deleted and
+    its predictions are pointed at the existing row.
+    """
+    try:
+        with transaction.atomic():
+            LightCurveFile.objects.bulk_create(light_curves)
+        return
+    except IntegrityError:
+        pass
+    
+    for lc_file in light_curves:
+        try:
+            with transaction.atomic():
+                lc_file.save(force_insert=True)
+        except IntegrityError:
+            existing = LightCurveFile.objects.get(content_sha256=lc_file.content_sha256)
+            if lc_file.file:
+                storage.delete(lc_file.file.name)
+            for prediction in predictions:
+                if prediction.light_curve is lc_file:
+                    prediction.light_curve = existing
 
 
 # ============================================================================
@@ -313,15 +824,25 @@ def visualize_lightcurve(request):
     Uses lightkurve to download from MAST when needed.
     """
     temp_path = None
+    uploaded = False
+    
+    # Parse the KepID once; everything below works with the int
+    request_params = request.query_params if request.method == 'GET' else request.data
+    try:
+        kepid_param = int(request_params['kepid']) if request_params.get('kepid') not in (None, '') else None
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'kepid must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     if request.method == 'GET':
         # GET method with prediction_id or kepid query param
         prediction_id = request.query_params.get('prediction_id')
-        kepid_param = request.query_params.get('kepid')
         
         if prediction_id:
             try:
-                prediction = Prediction.objects.get(id=prediction_id)
+                prediction = prediction_with_light_curve(prediction_id)
                 if prediction.light_curve.file:
                     fits_path = prediction.light_curve.file.path
                     title = f"KepID {prediction.light_curve.kepid} - {prediction.predicted_class_name}"
@@ -355,13 +876,12 @@ def visualize_lightcurve(request):
     
     else:  # POST
         # Check if kepid or fits_file provided
-        kepid_param = request.data.get('kepid')
         fits_file = request.data.get('fits_file')
         prediction_id = request.data.get('prediction_id')
         
         if prediction_id:
             try:
-                prediction = Prediction.objects.get(id=prediction_id)
+                prediction = prediction_with_light_curve(prediction_id)
                 if prediction.light_curve.file:
                     fits_path = prediction.light_curve.file.path
                 else:
@@ -385,12 +905,11 @@ def visualize_lightcurve(request):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
         elif fits_file:
-            # Save uploaded temp file
-            temp_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.fits")
-            with open(temp_path, 'wb+') as destination:
-                for chunk in fits_file.chunks():
-                    destination.write(chunk)
-            fits_path = temp_path
+            # Get uploaded file on disk
+            fits_path, owned = uploaded_fits_path(fits_file)
+            if owned:
+                temp_path = fits_path
+            uploaded = True
             title = "Uploaded Light Curve"
         else:
             return Response(
@@ -399,44 +918,43 @@ def visualize_lightcurve(request):
             )
     
     try:
-        import numpy as np
-        import base64
-        from .flux_utils import get_flux_from_lc, get_time_from_lc
-        
-        # Load light curve to extract metadata
-        lc = lk.read(fits_path)
-        
-        time = get_time_from_lc(lc)
-        flux = get_flux_from_lc(lc)
-        
-        # Remove NaNs
-        valid_mask = ~np.isnan(flux)
-        time_clean = time[valid_mask]
-        flux_clean = flux[valid_mask]
-        
-        # Create visualization as plotly JSON (no kaleido needed)
-        plot_json = create_interactive_plot(fits_path, title=title)
-        
-        # Extract metadata
-        duration = float(time_clean.max() - time_clean.min()) if len(time_clean) > 0 else 0
+        # Same file and title render the same figure
+        plot_cache = caches['plots']
+        cache_key = plot_cache_key(
+            fits_path, title, upload_sha256(fits_file, fits_path) if uploaded else None
+        )
+        response_data = plot_cache.get(cache_key)
         
-        response_data = {
-            'plot_json': plot_json,  # Plotly JSON format
-            'metadata': {
-                'flux_points': len(time_clean),
-                'duration_days': duration,
-                'flux_mean': float(np.mean(flux_clean)),
-                'flux_std': float(np.std(flux_clean)),
-                'flux_median': float(np.median(flux_clean)),
-                'data_quality_score': float(1.0 - (np.sum(~valid_mask) / len(flux))),
-                'gaps_detected': int(np.sum(np.diff(time_clean) > np.median(np.diff(time_clean)) * 3)),
-                'flux_type': 'PDCSAP' if hasattr(lc, 'pdcsap_flux') or 'pdcsap_flux' in [c.lower() for c in lc.colnames] else 'SAP'
+        if response_data is None:
+            # Read the file once for both the metadata and the plot
+            light_curve = load_light_curve(fits_path, uploaded)
+            
+            flux = light_curve['flux']
+            
+            # Create visualization as plotly JSON (no kaleido needed)
+            plot_json = create_interactive_plot(fits_path, title=title, light_curve=light_curve)
+            
+            # Extract metadata (NaN flux cadences excluded)
+            stats = lightcurve_stats(light_curve['time'], flux)
+            
+            response_data = {
+                'plot_json': plot_json,  # Plotly JSON format
+                'metadata': {
+                    'flux_points': stats['valid_points'],
+                    'duration_days': stats['duration_days'],
+                    'flux_mean': stats['mean'],
+                    'flux_std': stats['std'],
+                    'flux_median': stats['median'],
+                    'data_quality_score': float(stats['valid_points'] / len(flux)),
+                    'gaps_detected': stats['gaps'],
+                    'flux_type': 'PDCSAP' if light_curve['flux_type'] == 'PDCSAP_FLUX' else 'SAP'
+                }
             }
-        }
+            plot_cache.set(cache_key, response_data)
         
         # Add kepid if available
         if kepid_param:
-            response_data['kepid'] = int(kepid_param)
+            response_data['kepid'] = kepid_param
         
         return Response(response_data, status=status.HTTP_200_OK)
     
@@ -447,8 +965,8 @@ def visualize_lightcurve(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     finally:
-        if temp_path and os.path.exists(temp_path):
-            os.remove(temp_path)
+        if temp_path:
+            Path(temp_path).unlink(missing_ok=True)
 
 
 @api_view(['POST'])
@@ -464,12 +982,13 @@ def phase_fold(request):
     
     data = serializer.validated_data
     period = data['period']
+    temp_path = None
     epoch = data.get('epoch')
     
     # Get FITS file
     if data.get('prediction_id'):
         try:
-            prediction = Prediction.objects.get(id=data['prediction_id'])
+            prediction = prediction_with_light_curve(data['prediction_id'])
             fits_path = prediction.light_curve.file.path
         except Prediction.DoesNotExist:
             return Response(
@@ -477,15 +996,13 @@ def phase_fold(request):
                 status=status.HTTP_404_NOT_FOUND
             )
     else:
-        fits_file = data['fits_file']
-        temp_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.fits")
-        with open(temp_path, 'wb+') as destination:
-            for chunk in fits_file.chunks():
-                destination.write(chunk)
-        fits_path = temp_path
+        fits_path, owned = uploaded_fits_path(data['fits_file'])
+        if owned:
+            temp_path = fits_path
     
     try:
-        folded_data = phase_fold_light_curve(fits_path, period, epoch)
+        light_curve = load_light_curve(fits_path, uploaded=not data.get('prediction_id'))
+        folded_data = phase_fold_light_curve(fits_path, period, epoch, light_curve=light_curve)
         return Response(folded_data, status=status.HTTP_200_OK)
     
     except Exception as e:
@@ -494,8 +1011,8 @@ def phase_fold(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     finally:
-        if not data.get('prediction_id') and os.path.exists(temp_path):
-            os.remove(temp_path)
+        if temp_path:
+            Path(temp_path).unlink(missing_ok=True)
 
 
 @api_view(['POST'])
@@ -510,11 +1027,12 @@ def analyze_transits(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     data = serializer.validated_data
+    temp_path = None
     
     # Get FITS file
     if data.get('prediction_id'):
         try:
-            prediction = Prediction.objects.get(id=data['prediction_id'])
+            prediction = prediction_with_light_curve(data['prediction_id'])
             fits_path = prediction.light_curve.file.path
             lc_file = prediction.light_curve
         except Prediction.DoesNotExist:
@@ -523,26 +1041,35 @@ def analyze_transits(request):
                 status=status.HTTP_404_NOT_FOUND
             )
     else:
-        fits_file = data['fits_file']
-        temp_path = os.path.join(tempfile.gettempdir(), f"{uuid.uuid4()}.fits")
-        with open(temp_path, 'wb+') as destination:
-            for chunk in fits_file.chunks():
-                destination.write(chunk)
-        fits_path = temp_path
+        fits_path, owned = uploaded_fits_path(data['fits_file'])
+        if owned:
+            temp_path = fits_path
         lc_file = None
     
     try:
+        # Both analyses share one read of the file
+        light_curve = load_light_curve(fits_path, uploaded=lc_file is None)
+        
+        # Periodogram and BLS are independent and spend most of their time in
+        # NumPy/astropy kernels that release the GIL, so run them side by side
+        periodogram_future = ANALYSIS_POOL.submit(
+            calculate_periodogram, fits_path, light_curve=light_curve,
+            use_gpu=getattr(settings, 'EXOHUNT_GPU', False)
+        )
         transits = detect_transits(
             fits_path,
             period_min=data.get('period_min', 0.5),
             period_max=data.get('period_max', 50.0),
-            snr_threshold=data.get('snr_threshold', 7.0)
+            snr_threshold=data.get('snr_threshold', 7.0),
+            light_curve=light_curve,
+            use_gpu=getattr(settings, 'EXOHUNT_GPU', False),
+            algorithm=data.get('algorithm', 'bls')
         )
         
         # Save to database if we have a light curve file
         if lc_file and transits:
-            for transit in transits:
-                TransitDetection.objects.create(
+            TransitDetection.objects.bulk_create([
+                TransitDetection(
                     light_curve=lc_file,
                     start_time=0,  # Would need to calculate from period
                     end_time=0,
@@ -554,9 +1081,10 @@ def analyze_transits(request):
                     is_anomaly=transit.get('is_anomaly', False),
                     detection_algorithm=transit.get('detection_algorithm', 'BLS')
                 )
+                for transit in transits
+            ], batch_size=500)
         
-        # Also calculate periodogram
-        periodogram = calculate_periodogram(fits_path)
+        periodogram = periodogram_future.result()
         
         response_data = {
             'transits_detected': len(transits),
@@ -572,8 +1100,8 @@ def analyze_transits(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     finally:
-        if not data.get('prediction_id') and os.path.exists(temp_path):
-            os.remove(temp_path)
+        if temp_path:
+            Path(temp_path).unlink(missing_ok=True)
 
 
 # ============================================================================
@@ -587,56 +1115,115 @@ def dashboard_stats(request):
     
     Get overall dashboard statistics.
     """
-    total_predictions = Prediction.objects.count()
-    
-    # Class distribution
-    class_counts = Prediction.objects.values('predicted_class_name').annotate(
-        count=Count('id')
-    )
+    cache_key = dashboard_cache_key('stats')
+    stats = cache.get(cache_key)
+    if stats is not None:
+        return Response(stats, status=status.HTTP_200_OK)
     
-    # Recent activity (last 7 days)
-    from datetime import timedelta
+    # Totals, recent activity (last 7 days), average confidence and the
+    # per-class counts as one conditional aggregate, without a GROUP BY
     week_ago = timezone.now() - timedelta(days=7)
-    recent_predictions = Prediction.objects.filter(created_at__gte=week_ago).count()
-    
-    # Average confidence
-    avg_confidence = Prediction.objects.aggregate(Avg('confidence'))['confidence__avg']
+    totals = Prediction.objects.aggregate(
+        total=Count('id'),
+        recent=Count('id', filter=Q(created_at__gte=week_ago)),
+        avg_confidence=Avg('confidence'),
+        **{
+            f'class_{i}': Count('id', filter=Q(predicted_class_name=name))
+            for i, name in enumerate(CLASS_NAMES)
+        }
+    )
+    avg_confidence = totals['avg_confidence']
     
     # Latest model metrics
-    latest_metrics = ModelMetrics.objects.first()
+    latest_metrics = ModelMetrics.objects.only(
+        'accuracy', 'f1_score_weighted', 'model_version'
+    ).first()
     
     stats = {
-        'total_predictions': total_predictions,
-        'recent_predictions_7d': recent_predictions,
+        'total_predictions': totals['total'],
+        'recent_predictions_7d': totals['recent'],
         'average_confidence': round(avg_confidence, 3) if avg_confidence else 0,
-        'class_distribution': {item['predicted_class_name']: item['count'] for item in class_counts},
+        # Classes with no predictions are left out, as the old GROUP BY did
+        'class_distribution': {
+            name: totals[f'class_{i}'] for i, name in enumerate(CLASS_NAMES) if totals[f'class_{i}']
+        },
         'model_performance': {
             'accuracy': latest_metrics.accuracy if latest_metrics else None,
             'f1_score': latest_metrics.f1_score_weighted if latest_metrics else None,
             'version': latest_metrics.model_version if latest_metrics else None
         } if latest_metrics else None
     }
+    cache.set(cache_key, stats, settings.DASHBOARD_CACHE_TTL)
     
     return Response(stats, status=status.HTTP_200_OK)
 
 
+# Largest page recent_predictions serves; bigger limits are clamped to it
+RECENT_PREDICTIONS_MAX_LIMIT = 200
+
+
 @api_view(['GET'])
 def recent_predictions(request):
     """
     GET /api/dashboard/recent-predictions/
     
-    Get recent predictions with pagination.
+    Get recent predictions with pagination. Pass the previous page's
+    next_cursor as ?cursor= to page deeply without an OFFSET scan.
     """
-    limit = int(request.query_params.get('limit', 50))
-    offset = int(request.query_params.get('offset', 0))
+    try:
+        limit = int(request.query_params.get('limit', 50))
+        offset = int(request.query_params.get('offset', 0))
+    except ValueError:
+        return Response(
+            {'error': 'limit and offset must be integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if limit < 1 or offset < 0:
+        return Response(
+            {'error': 'limit must be at least 1 and offset non-negative'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    limit = min(limit, RECENT_PREDICTIONS_MAX_LIMIT)
+    cursor = request.query_params.get('cursor')
     
-    predictions = Prediction.objects.all().order_by('-created_at')[offset:offset+limit]
-    serializer = PredictionSerializer(predictions, many=True)
+    cache_key = dashboard_cache_key('recent', limit, offset, cursor or '')
+    data = cache.get(cache_key)
+    if data is None:
+        predictions = for_prediction_listing(Prediction.objects.order_by('-created_at', '-id'))
+        if cursor:
+            # Keyset pagination: seek past the last row of the previous page
+            # instead of making the database scan and discard `offset` rows
+            try:
+                last_id = uuid.UUID(cursor)
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid cursor'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # Compare against the stored timestamp, not a re-encoded one
+            last_created = Prediction.objects.filter(pk=last_id).values('created_at')[:1]
+            predictions = predictions.filter(
+                Q(created_at__lt=Subquery(last_created))
+                | Q(created_at=Subquery(last_created), id__lt=last_id)
+            )[:limit]
+        else:
+            predictions = predictions[offset:offset+limit]
+        predictions = list(predictions)
+        serializer = PredictionSerializer(predictions, many=True)
+        # One COUNT shared by every page until predictions change
+        total = cache.get_or_set(
+            dashboard_cache_key('prediction_count'),
+            Prediction.objects.count,
+            settings.DASHBOARD_CACHE_TTL
+        )
+        data = {
+            'count': total,
+            'results': list(serializer.data),
+            'next_cursor': str(predictions[-1].pk) if predictions and len(predictions) == limit else None
+        }
+        cache.set(cache_key, data, settings.DASHBOARD_CACHE_TTL)
     
-    return Response({
-        'count': Prediction.objects.count(),
-        'results': serializer.data
-    }, status=status.HTTP_200_OK)
+    return Response(data, status=status.HTTP_200_OK)
 
 
 # ============================================================================
@@ -680,11 +1267,26 @@ class AnalysisSessionViewSet(viewsets.ModelViewSet):
     def predictions(self, request, pk=None):
         """Get all predictions in this session"""
         session = self.get_object()
-        predictions = session.predictions.all()
+        predictions = for_prediction_listing(session.predictions.all())
         serializer = PredictionSerializer(predictions, many=True)
         return Response(serializer.data)
 
 
+class BatchJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Read-only access to batch prediction jobs"""
+    queryset = BatchJob.objects.all()
+    serializer_class = BatchJobSerializer
+    
+    def get_queryset(self):
+        # Progress is computed by the database instead of per row in Python
+        return BatchJob.objects.annotate(
+            progress=Coalesce(
+                Cast('processed_files', FloatField()) * 100.0 / NullIf(F('total_files'), 0),
+                0.0
+            )
+        )
+
+
 # ============================================================================
 # HELPER ENDPOINTS - KepID Search & Examples
 # ============================================================================
@@ -713,54 +1315,23 @@ def search_by_kepid(request):
         )
     
     # Load KOI data
-    koi_csv_path = os.path.join(settings.BASE_DIR, '..', 'dataset', 'koi.csv')
-    if not os.path.exists(koi_csv_path):
+    if not os.path.exists(KOI_CSV_PATH):
         return Response(
             {'error': 'KOI dataset not found'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     
     try:
-        df = pd.read_csv(koi_csv_path)
-        koi_data = df[df['kepid'] == kepid]
+        row = koi_index().get(kepid)
         
-        if koi_data.empty:
+        if row is None:
             return Response(
                 {'error': f'No KOI data found for KepID {kepid}'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get first matching row
-        row = koi_data.iloc[0]
-        
-        # Helper function to safely get string values (handle NaN)
-        def safe_str(value):
-            if pd.isna(value):
-                return None
-            return str(value) if value != '' else None
-        
         # Extract parameters
-        params = {
-            'kepid': int(kepid),
-            'koi_period': float(row['koi_period']) if pd.notna(row.get('koi_period')) else None,
-            'koi_duration': float(row['koi_duration']) if pd.notna(row.get('koi_duration')) else None,
-            'koi_depth': float(row['koi_depth']) if pd.notna(row.get('koi_depth')) else None,
-            'koi_prad': float(row['koi_prad']) if pd.notna(row.get('koi_prad')) else None,
-            'koi_ror': float(row['koi_ror']) if pd.notna(row.get('koi_ror')) else None,
-            'koi_model_snr': float(row['koi_model_snr']) if pd.notna(row.get('koi_model_snr')) else None,
-            'koi_num_transits': int(row['koi_num_transits']) if pd.notna(row.get('koi_num_transits')) else None,
-            'koi_steff': float(row['koi_steff']) if pd.notna(row.get('koi_steff')) else None,
-            'koi_slogg': float(row['koi_slogg']) if pd.notna(row.get('koi_slogg')) else None,
-            'koi_srad': float(row['koi_srad']) if pd.notna(row.get('koi_srad')) else None,
-            'koi_smass': float(row['koi_smass']) if pd.notna(row.get('koi_smass')) else None,
-            'koi_kepmag': float(row['koi_kepmag']) if pd.notna(row.get('koi_kepmag')) else None,
-            'koi_insol': float(row['koi_insol']) if pd.notna(row.get('koi_insol')) else None,
-            'koi_dor': float(row['koi_dor']) if pd.notna(row.get('koi_dor')) else None,
-            'koi_count': int(row['koi_count']) if pd.notna(row.get('koi_count')) else None,
-            # 'koi_score' REMOVED - data leakage (0.89 correlation with label)
-            'koi_disposition': safe_str(row.get('koi_disposition')),
-            'kepler_name': safe_str(row.get('kepler_name')),
-        }
+        params = koi_row_params(int(kepid), row)
         
         return Response({
             'success': True,
@@ -792,6 +1363,68 @@ EXAMPLE_KEPIDS = [
 ]
 
 
+def prefetch_example_light_curves():
+    """
+    Make sure every EXAMPLE_KEPIDS light curve is on disk with its arrays
+    cached, so the first demo click doesn't wait on MAST or a FITS parse.
+    Starts threads, so under gunicorn it runs in each worker, never in the
+    master before it forks.
+    """
+    def fetch(kepid):
+        get_cached_light_curve(fast_download_lightcurve(kepid))
+    
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix='prefetch') as pool:
+        futures = [(kepid, pool.submit(fetch, kepid)) for kepid in EXAMPLE_KEPIDS]
+        for kepid, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Prefetch failed for KepID {kepid}: {e}")
+
+
+# (koi_index() it was built from, [(kepid, payload or None), ...])
+_EXAMPLE_PAYLOADS = None
+
+
+def example_payloads():
+    """
+    get_example_data responses for every EXAMPLE_KEPIDS entry, built once
+    per loaded KOI index so a request only has to pick one.
+    """
+    global _EXAMPLE_PAYLOADS
+    index = koi_index()
+    cached = _EXAMPLE_PAYLOADS
+    if cached is not None and cached[0] is index:
+        return cached[1]
+    
+    payloads = []
+    for kepid in EXAMPLE_KEPIDS:
+        example = index.get(kepid)
+        if example is None:
+            payloads.append((kepid, None))
+            continue
+        
+        fits_available = local_fits(kepid) is not None
+        
+        params = koi_row_params(kepid, example)
+        
+        # Get display name for message
+        kepler_name = params['kepler_name']
+        display_name = kepler_name if kepler_name else f"KepID {kepid}"
+        disposition = params['koi_disposition'] or 'UNKNOWN'
+        
+        payloads.append((kepid, {
+            'success': True,
+            'kepid': kepid,
+            'parameters': params,
+            'fits_source': 'local' if fits_available else 'lightkurve',
+            'message': f'Example: {display_name} ({disposition}). {"Instant loading from local FITS!" if fits_available else "FITS will be downloaded from MAST."}'
+        }))
+    
+    _EXAMPLE_PAYLOADS = (index, payloads)
+    return payloads
+
+
 @api_view(['GET'])
 def get_example_data(request):
     """
@@ -802,12 +1435,7 @@ def get_example_data(request):
     """
     import random
     
-    koi_csv_path = os.path.join(settings.BASE_DIR, '..', 'dataset', 'koi.csv')
-    # First check exodetect/example_lightcurves (for deployment), then fallback to parent lightcurves
-    example_lightcurves_dir = os.path.join(settings.BASE_DIR, 'example_lightcurves')
-    lightcurves_dir = os.path.join(settings.BASE_DIR, '..', 'lightcurves')
-    
-    if not os.path.exists(koi_csv_path):
+    if not os.path.exists(KOI_CSV_PATH):
         return Response(
             {'error': 'KOI dataset not found'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -815,75 +1443,18 @@ def get_example_data(request):
     
     try:
         # Randomly select from curated examples
-        kepid = random.choice(EXAMPLE_KEPIDS)
-        
-        # Check if local FITS file exists (prioritize example_lightcurves for deployment)
-        local_fits = os.path.join(example_lightcurves_dir, f'{kepid}.fits')
-        if not os.path.exists(local_fits):
-            # Fallback to parent lightcurves directory
-            local_fits = os.path.join(lightcurves_dir, f'{kepid}.fits')
-        fits_available = os.path.exists(local_fits)
-        
-        # Load parameters from koi.csv
-        df = pd.read_csv(koi_csv_path)
-        example = df[df['kepid'] == kepid]
+        kepid, payload = random.choice(example_payloads())
         
-        if example.empty:
+        if payload is None:
             return Response(
                 {'error': f'KepID {kepid} not found in dataset'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        example = example.iloc[0]
-        
-        # Helper function to safely get string values (handle NaN)
-        def safe_str(value):
-            if pd.isna(value):
-                return None
-            return str(value) if value != '' else None
-        
-        params = {
-            'kepid': kepid,
-            'koi_period': float(example['koi_period']) if pd.notna(example.get('koi_period')) else None,
-            'koi_duration': float(example['koi_duration']) if pd.notna(example.get('koi_duration')) else None,
-            'koi_depth': float(example['koi_depth']) if pd.notna(example.get('koi_depth')) else None,
-            'koi_prad': float(example['koi_prad']) if pd.notna(example.get('koi_prad')) else None,
-            'koi_ror': float(example['koi_ror']) if pd.notna(example.get('koi_ror')) else None,
-            'koi_model_snr': float(example['koi_model_snr']) if pd.notna(example.get('koi_model_snr')) else None,
-            'koi_num_transits': int(example['koi_num_transits']) if pd.notna(example.get('koi_num_transits')) else None,
-            'koi_steff': float(example['koi_steff']) if pd.notna(example.get('koi_steff')) else None,
-            'koi_slogg': float(example['koi_slogg']) if pd.notna(example.get('koi_slogg')) else None,
-            'koi_srad': float(example['koi_srad']) if pd.notna(example.get('koi_srad')) else None,
-            'koi_smass': float(example['koi_smass']) if pd.notna(example.get('koi_smass')) else None,
-            'koi_kepmag': float(example['koi_kepmag']) if pd.notna(example.get('koi_kepmag')) else None,
-            'koi_insol': float(example['koi_insol']) if pd.notna(example.get('koi_insol')) else None,
-            'koi_dor': float(example['koi_dor']) if pd.notna(example.get('koi_dor')) else None,
-            'koi_count': int(example['koi_count']) if pd.notna(example.get('koi_count')) else None,
-            # 'koi_score' REMOVED - data leakage (0.89 correlation with label)
-            'koi_disposition': safe_str(example.get('koi_disposition')),
-            'kepler_name': safe_str(example.get('kepler_name')),
-        }
-        
-        # Get display name for message
-        kepler_name = safe_str(example.get('kepler_name'))
-        display_name = kepler_name if kepler_name else f"KepID {kepid}"
-        disposition = safe_str(example.get('koi_disposition')) or 'UNKNOWN'
-        
-        return Response({
-            'success': True,
-            'kepid': kepid,
-            'parameters': params,
-            'fits_source': 'local' if fits_available else 'lightkurve',
-            'message': f'Example: {display_name} ({disposition}). {"Instant loading from local FITS!" if fits_available else "FITS will be downloaded from MAST."}'
-        })
+        return Response(payload)
     
     except Exception as e:
         return Response(
             {'error': f'Error getting example: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
-        """Get all predictions in a session"""
-        session = self.get_object()
-        predictions = session.predictions.all()
-        serializer = PredictionSerializer(predictions, many=True)
-        return Response(serializer.data)
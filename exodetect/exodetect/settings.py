@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "django.middleware.gzip.GZipMiddleware",  # Compress JSON responses (flux arrays shrink ~5x)
     "corsheaders.middleware.CorsMiddleware",  # CORS must be before CommonMiddleware
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -128,6 +130,12 @@ STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Spool every upload straight to a temp file so FITS files are only written to disk once,
+# hashing it on the way so upload dedupe doesn't read it back
+FILE_UPLOAD_HANDLERS = [
+    "api.uploadhandlers.HashingTemporaryFileUploadHandler",
+]
+
 # CORS settings for frontend development
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React default
@@ -145,6 +153,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",  # Change to IsAuthenticated in production
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
         "rest_framework.parsers.MultiPartParser",
@@ -152,6 +164,70 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Load the prediction model when the server boots instead of on the first request. Under
+# gunicorn a CPU model is loaded once in the master; GPU models in each worker after fork
+PREDICTOR_WARMUP = True
+
+# Download/cache the EXAMPLE_KEPIDS light curves in a background thread at boot
+EXAMPLE_PREFETCH = True
+
+# Gunicorn worker processes (gunicorn.conf.py reads the same variable)
+WEB_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Intra-op threads per server process: the cores split evenly between the workers.
+# Applied in each worker after fork; the preloading master itself stays single-threaded
+TORCH_NUM_THREADS = max(1, (os.cpu_count() or 1) // WEB_WORKERS)
+
+# BF16 autocast for CPU inference on hardware with native BF16 (AVX512-BF16/AMX); changes
+# probabilities in the third decimal, so it also changes model_version
+PREDICTOR_CPU_BF16 = False
+
+# Mixed precision for CUDA inference (BF16 on Ampere and newer, FP16 before); also
+# changes model_version, so stored FP32 predictions are not reused for it
+PREDICTOR_CUDA_AMP = False
+
+# Coalesce concurrent predictions into one forward pass, waiting at most this long (0 disables)
+PREDICTOR_BATCH_WINDOW_MS = 20
+
+# Threads running queued (run_async) predictions; 1 keeps inference serialized on a single GPU
+PREDICTION_WORKERS = 1
+
+# Threads fetching light curves from MAST for queued KepID predictions
+DOWNLOAD_WORKERS = 4
+
+# Run the BLS transit search (cuvarbase) and the periodogram (CuPy) on the GPU;
+# each falls back to the CPU if its library is unavailable
+EXOHUNT_GPU = False
+
+# Threads shared by requests that run independent light-curve analyses in parallel
+ANALYSIS_WORKERS = 4
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Rendered light curve plots, shared by all workers and kept across restarts
+    "plots": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR.parent / "lightcurves_cache" / "plots",
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {"MAX_ENTRIES": 500},
+    },
+    # Small state every worker must agree on (the dashboard cache version token)
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR.parent / "lightcurves_cache" / "shared",
+    },
+}
+
+# Seconds dashboard responses stay cached; a new prediction in any worker invalidates
+# them early, because the version token in their keys lives in the "shared" cache
+DASHBOARD_CACHE_TTL = 30
+
+# Seconds a worker reuses its copy of that token before re-reading the shared cache,
+# so another worker's new predictions can take this long to reach its dashboards
+DASHBOARD_VERSION_TTL = 2
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
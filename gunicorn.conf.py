@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for the Procfile web process.
+
+The app is preloaded in the master, which warms up in when_ready right
+before forking. Anything that must not exist at fork time (threads, CUDA
+contexts, the worker's torch thread count) is set up per worker in post_fork.
+"""
+import os
+
+# Keep in sync with WEB_WORKERS in settings.py, which sizes TORCH_NUM_THREADS
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+preload_app = True
+
+# Tells ApiConfig.ready() that the hooks below do the boot work
+os.environ['EXOHUNT_GUNICORN_HOOKS'] = '1'
+
+
+def when_ready(server):
+    from api.apps import master_boot
+    
+    master_boot()
+
+
+def post_fork(server, worker):
+    from api.apps import worker_boot
+    
+    worker_boot()
@@ -7,11 +7,13 @@ Usage:
     python test_prediction.py 10854555 10872983 11918099
 """
 
+import csv
 import sys
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-import pandas as pd
 
 # Add Django project to path
 sys.path.insert(0, str(Path(__file__).parent / 'exodetect'))
@@ -20,62 +22,85 @@ sys.path.insert(0, str(Path(__file__).parent / 'exodetect'))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exodetect.settings')
 import django
 django.setup()
+from django.conf import settings
 
 from api.inference import ExoplanetPredictor
-import lightkurve as lk
+from api.flux_utils import read_fits_light_curve
 
 
-def load_koi_parameters(kepid: int) -> dict:
-    """Load KOI parameters from dataset CSV."""
+# Tabular model inputs, in the order they are passed to the predictor
+KOI_PARAM_COLUMNS = [
+    'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_ror',
+    'koi_model_snr', 'koi_num_transits', 'koi_steff', 'koi_slogg', 'koi_srad',
+    'koi_smass', 'koi_kepmag', 'koi_insol', 'koi_dor', 'koi_count',
+    # 'koi_score': REMOVED - data leakage (0.89 correlation with disposition)
+]
+KOI_INT_COLUMNS = ['koi_num_transits', 'koi_count']
+KOI_TEXT_COLUMNS = ['koi_disposition', 'kepler_name']
+
+
+@lru_cache(maxsize=1)
+def load_koi_table() -> dict:
+    """
+    Read the KOI dataset CSV once per run. Returns {kepid: raw strings of
+    KOI_PARAM_COLUMNS + KOI_TEXT_COLUMNS}, keeping the first row per kepid.
+    Uses the csv module, since importing pandas alone takes longer than
+    reading the whole file this way.
+    """
     koi_csv = Path(__file__).parent / 'dataset' / 'koi.csv'
     
     if not koi_csv.exists():
         raise FileNotFoundError(f"KOI dataset not found at {koi_csv}")
     
-    df = pd.read_csv(koi_csv)
-    koi_data = df[df['kepid'] == kepid]
+    table = {}
+    with koi_csv.open(newline='') as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        kepid_pos = header.index('kepid')
+        positions = [header.index(name) for name in KOI_PARAM_COLUMNS + KOI_TEXT_COLUMNS]
+        for row in reader:
+            kepid = int(row[kepid_pos])
+            if kepid not in table:
+                table[kepid] = [row[i] for i in positions]
+    return table
+
+
+def load_koi_parameters(kepid: int) -> dict:
+    """Load KOI parameters from dataset CSV."""
+    values = load_koi_table().get(kepid)
     
-    if koi_data.empty:
+    if values is None:
         raise ValueError(f"No KOI data found for KepID {kepid}")
     
-    row = koi_data.iloc[0]
-    
-    # Helper to safely convert values
-    def safe_float(value):
-        return float(value) if pd.notna(value) else None
-    
-    def safe_int(value):
-        return int(value) if pd.notna(value) else None
-    
-    def safe_str(value):
-        return str(value) if pd.notna(value) and value != '' else None
-    
-    params = {
-        'koi_period': safe_float(row.get('koi_period')),
-        'koi_duration': safe_float(row.get('koi_duration')),
-        'koi_depth': safe_float(row.get('koi_depth')),
-        'koi_prad': safe_float(row.get('koi_prad')),
-        'koi_ror': safe_float(row.get('koi_ror')),
-        'koi_model_snr': safe_float(row.get('koi_model_snr')),
-        'koi_num_transits': safe_int(row.get('koi_num_transits')),
-        'koi_steff': safe_float(row.get('koi_steff')),
-        'koi_slogg': safe_float(row.get('koi_slogg')),
-        'koi_srad': safe_float(row.get('koi_srad')),
-        'koi_smass': safe_float(row.get('koi_smass')),
-        'koi_kepmag': safe_float(row.get('koi_kepmag')),
-        'koi_insol': safe_float(row.get('koi_insol')),
-        'koi_dor': safe_float(row.get('koi_dor')),
-        'koi_count': safe_int(row.get('koi_count')),
-        # 'koi_score': REMOVED - data leakage (0.89 correlation with disposition)
-    }
+    # Empty CSV fields are missing values
+    params = {}
+    for name, value in zip(KOI_PARAM_COLUMNS, values):
+        if value == '':
+            params[name] = None
+        elif name in KOI_INT_COLUMNS:
+            params[name] = int(float(value))
+        else:
+            params[name] = float(value)
     
     # Additional info for display
-    params['_disposition'] = safe_str(row.get('koi_disposition'))
-    params['_kepler_name'] = safe_str(row.get('kepler_name'))
+    disposition, kepler_name = values[len(KOI_PARAM_COLUMNS):]
+    params['_disposition'] = disposition or None
+    params['_kepler_name'] = kepler_name or None
     
     return params
 
 
+BAR_WIDTH = 40
+_BAR_FULL = '█' * BAR_WIDTH
+_BAR_EMPTY = '░' * BAR_WIDTH
+
+
+def probability_bar(prob: float) -> str:
+    """Fixed-width text bar for a probability, sliced from prebuilt strings."""
+    filled = int(prob * BAR_WIDTH)
+    return _BAR_FULL[:filled] + _BAR_EMPTY[filled:]
+
+
 def load_fits_file(kepid: int) -> str:
     """Find and return path to local FITS file."""
     # Check multiple possible locations
@@ -94,25 +119,50 @@ def load_fits_file(kepid: int) -> str:
     )
 
 
-def predict_exoplanet(kepid: int, verbose: bool = True):
+def load_predictor() -> ExoplanetPredictor:
+    """Load the trained model, reusing it until the checkpoint file changes."""
+    model_path = Path(__file__).parent / 'training' / 'exoplanet_hybrid.pth'
+    
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model not found at {model_path}")
+    
+    return _load_predictor(model_path, model_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _load_predictor(model_path: Path, mtime_ns: int) -> ExoplanetPredictor:
+    base_dir = Path(__file__).parent
+    return ExoplanetPredictor(
+        model_path=str(model_path),
+        scaler_path=str(base_dir / 'training' / 'koi_scaler.joblib'),
+        features_path=str(base_dir / 'training' / 'tab_features_list.joblib'),
+        seq_len=2000,
+        # KepIDs predicted on main()'s threads share batched forward passes
+        batch_window_ms=getattr(settings, 'PREDICTOR_BATCH_WINDOW_MS', 20)
+    )
+
+
+def predict_exoplanet(kepid: int, predictor: ExoplanetPredictor = None, verbose: bool = True, log=print):
     """
     Make prediction for a given KepID using local files.
     
     Args:
         kepid: Kepler ID to predict
+        predictor: Loaded model (defaults to load_predictor())
         verbose: Print detailed output
+        log: Called with each output line (defaults to print)
     
     Returns:
         Dictionary with prediction results
     """
     if verbose:
-        print(f"\n{'='*70}")
-        print(f"🔭 Predicting for KepID: {kepid}")
-        print(f"{'='*70}")
+        log(f"\n{'='*70}")
+        log(f"🔭 Predicting for KepID: {kepid}")
+        log(f"{'='*70}")
     
     # Load KOI parameters
     if verbose:
-        print("\n1️⃣  Loading KOI parameters from dataset...")
+        log("\n1️⃣  Loading KOI parameters from dataset...")
     
     try:
         params = load_koi_parameters(kepid)
@@ -120,64 +170,53 @@ def predict_exoplanet(kepid: int, verbose: bool = True):
         kepler_name = params.pop('_kepler_name', None)
         
         if verbose:
-            print(f"   ✅ Parameters loaded")
-            print(f"   📊 Actual Classification: {actual_disposition}")
+            log(f"   ✅ Parameters loaded")
+            log(f"   📊 Actual Classification: {actual_disposition}")
             if kepler_name:
-                print(f"   🪐 Kepler Name: {kepler_name}")
+                log(f"   🪐 Kepler Name: {kepler_name}")
     except Exception as e:
-        print(f"   ❌ Error loading parameters: {e}")
+        log(f"   ❌ Error loading parameters: {e}")
         return None
     
     # Load FITS file
     if verbose:
-        print("\n2️⃣  Loading light curve from local FITS file...")
+        log("\n2️⃣  Loading light curve from local FITS file...")
     
     try:
         fits_path = load_fits_file(kepid)
         if verbose:
-            print(f"   ✅ Found: {fits_path}")
+            log(f"   ✅ Found: {fits_path}")
         
-        # Load with lightkurve
-        lc = lk.read(fits_path)
+        # Read the columns once; the predictor reuses them instead of
+        # opening the file again
+        light_curve = read_fits_light_curve(fits_path)
         if verbose:
-            print(f"   📈 Light curve loaded: {len(lc)} data points")
+            log(f"   📈 Light curve loaded: {len(light_curve['time'])} data points")
     except Exception as e:
-        print(f"   ❌ Error loading FITS: {e}")
+        log(f"   ❌ Error loading FITS: {e}")
         return None
     
     # Make prediction
     if verbose:
-        print("\n3️⃣  Running model prediction...")
+        log("\n3️⃣  Running model prediction...")
     
     try:
-        start_time = time.time()
-        
-        # Initialize predictor with model paths
-        base_dir = Path(__file__).parent
-        model_path = base_dir / 'training' / 'exoplanet_hybrid.pth'
-        scaler_path = base_dir / 'training' / 'koi_scaler.joblib'
-        features_path = base_dir / 'training' / 'tab_features_list.joblib'
+        if predictor is None:
+            predictor = load_predictor()
         
-        if not model_path.exists():
-            raise FileNotFoundError(f"Model not found at {model_path}")
-        
-        predictor = ExoplanetPredictor(
-            model_path=str(model_path),
-            scaler_path=str(scaler_path),
-            features_path=str(features_path),
-            seq_len=2000
-        )
+        start_ns = time.perf_counter_ns()
         
-        # Make prediction using FITS file path
+        # Make prediction from the light curve read above
         result = predictor.predict(
             fits_path=fits_path,
-            koi_params=params
+            koi_params=params,
+            light_curve=light_curve
         )
         
-        elapsed = time.time() - start_time
+        elapsed_ns = time.perf_counter_ns() - start_ns
         
         if verbose:
-            print(f"   ✅ Prediction completed in {elapsed:.2f}s")
+            log(f"   ✅ Prediction completed in {elapsed_ns / 1e9:.2f}s")
         
         # Display results
         predicted_class = result['predicted_class_name']
@@ -185,24 +224,22 @@ def predict_exoplanet(kepid: int, verbose: bool = True):
         probabilities = result['probabilities']
         
         if verbose:
-            print(f"\n{'='*70}")
-            print(f"📊 RESULTS")
-            print(f"{'='*70}")
-            print(f"Predicted Class:  {predicted_class}")
-            print(f"Confidence:       {confidence*100:.2f}%")
-            print(f"\nClass Probabilities:")
+            log(f"\n{'='*70}")
+            log(f"📊 RESULTS")
+            log(f"{'='*70}")
+            log(f"Predicted Class:  {predicted_class}")
+            log(f"Confidence:       {confidence*100:.2f}%")
+            log(f"\nClass Probabilities:")
             for cls, prob in probabilities.items():
-                bar_length = int(prob * 40)
-                bar = '█' * bar_length + '░' * (40 - bar_length)
-                print(f"  {cls:15} {bar} {prob*100:.2f}%")
+                log(f"  {cls:15} {probability_bar(prob)} {prob*100:.2f}%")
             
             # Compare with actual
             if actual_disposition:
                 match = '✅ CORRECT' if predicted_class == actual_disposition else '❌ INCORRECT'
-                print(f"\nActual:           {actual_disposition}")
-                print(f"Match:            {match}")
+                log(f"\nActual:           {actual_disposition}")
+                log(f"Match:            {match}")
             
-            print(f"{'='*70}\n")
+            log(f"{'='*70}\n")
         
         return {
             'kepid': kepid,
@@ -211,14 +248,14 @@ def predict_exoplanet(kepid: int, verbose: bool = True):
             'probabilities': probabilities,
             'actual_disposition': actual_disposition,
             'kepler_name': kepler_name,
-            'processing_time': elapsed,
+            'processing_time_ns': elapsed_ns,
             'correct': predicted_class == actual_disposition if actual_disposition else None
         }
         
     except Exception as e:
-        print(f"   ❌ Error during prediction: {e}")
+        log(f"   ❌ Error during prediction: {e}")
         import traceback
-        traceback.print_exc()
+        log(traceback.format_exc().rstrip())
         return None
 
 
@@ -243,33 +280,53 @@ def main():
             print(f"Error: '{arg}' is not a valid integer KepID")
             sys.exit(1)
     
-    # Run predictions
+    # Load the model once for every KepID, parsing the KOI catalogue on a
+    # second thread meanwhile (both are cached, so later calls reuse them;
+    # a catalogue error is reported per KepID as before)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(load_koi_table)
+        try:
+            predictor = load_predictor()
+        except Exception as e:
+            print(f"❌ Error loading model: {e}")
+            sys.exit(1)
+    
+    # Run predictions side by side: FITS reads and torch ops release the GIL.
+    # Each KepID's output is buffered and printed in order once it finishes.
+    def run(kepid):
+        lines = []
+        return predict_exoplanet(kepid, predictor, verbose=True, log=lines.append), lines
+    
     results = []
-    for kepid in kepids:
-        result = predict_exoplanet(kepid, verbose=True)
-        if result:
-            results.append(result)
+    with ThreadPoolExecutor(max_workers=min(4, len(kepids))) as executor:
+        for result, lines in executor.map(run, kepids):
+            print('\n'.join(lines))
+            if result:
+                results.append(result)
     
-    # Summary if multiple predictions
+    # Summary if multiple predictions, written in one go
     if len(results) > 1:
-        print(f"\n{'='*70}")
-        print(f"📈 SUMMARY ({len(results)} predictions)")
-        print(f"{'='*70}")
+        lines = [
+            f"\n{'='*70}",
+            f"📈 SUMMARY ({len(results)} predictions)",
+            f"{'='*70}",
+        ]
         
         correct = sum(1 for r in results if r.get('correct') is True)
         incorrect = sum(1 for r in results if r.get('correct') is False)
-        unknown = sum(1 for r in results if r.get('correct') is None)
         
-        print(f"\nAccuracy: {correct}/{correct+incorrect} correct ({correct/(correct+incorrect)*100:.1f}%)" if (correct+incorrect) > 0 else "")
-        print(f"\nDetailed Results:")
+        lines.append(f"\nAccuracy: {correct}/{correct+incorrect} correct ({correct/(correct+incorrect)*100:.1f}%)" if (correct+incorrect) > 0 else "")
+        lines.append(f"\nDetailed Results:")
         for r in results:
             status = '✅' if r.get('correct') else ('❌' if r.get('correct') is False else '❓')
-            print(f"  {status} KepID {r['kepid']:8} - Predicted: {r['predicted_class']:15} "
-                  f"(Confidence: {r['confidence']*100:5.1f}%) - Actual: {r.get('actual_disposition', 'N/A')}")
+            lines.append(f"  {status} KepID {r['kepid']:8} - Predicted: {r['predicted_class']:15} "
+                         f"(Confidence: {r['confidence']*100:5.1f}%) - Actual: {r.get('actual_disposition', 'N/A')}")
         
-        avg_time = sum(r['processing_time'] for r in results) / len(results)
-        print(f"\nAverage processing time: {avg_time:.2f}s")
-        print(f"{'='*70}\n")
+        # Integer nanoseconds summed exactly, converted to seconds once
+        avg_time = sum(r['processing_time_ns'] for r in results) / (len(results) * 1e9)
+        lines.append(f"\nAverage processing time: {avg_time:.2f}s")
+        lines.append(f"{'='*70}\n")
+        print('\n'.join(lines))
 
 
 if __name__ == '__main__':